@@ -1,22 +1,132 @@
-from flask import render_template, request, redirect, url_for, flash, session
-from datetime import datetime, timedelta, timezone
-from sqlalchemy import cast, Integer, text
+import csv
+import io
+import math
+from flask import render_template, request, redirect, url_for, flash, session, jsonify, abort
+from datetime import date as date_cls, datetime, time, timedelta, timezone
 from db import create_app, db
 from db.models import Reservation, PersonalReservation
+from db.occupancy import load_occupancies
+from db.versions import current_versions, versions_etag
+from db.events import latest_event_id
+from db.booking import (
+    book, book_series, repeat_dates, extend, cancel_many, student_bookings, BookingConflict, InvalidBooking,
+)
+from db.resources import list_resources, get_resource, catalog_codes, buildings, free_resources
+from db.utilization import utilization_report, MAX_REPORT_DAYS
+from services.logs import get_logger
 
 app = create_app()
+grid_cache = app.extensions["grid_cache"]
+event_bus = app.extensions["event_bus"]
 KST = timezone(timedelta(hours=9))
+log = get_logger("app")
 # ---------------- 유틸 ----------------
-def make_days(n=7):
-    """✅ 오늘부터 n일치 날짜 리스트 생성 (한국 시간 기준)"""
-    base = datetime.now(KST).replace(hour=0, minute=0, second=0, microsecond=0)
-    return [(base + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(n)]
+MAX_WINDOW_DAYS = 7
 
-def hours_24():
-    return list(range(24))
+def make_days(n=7, start=None):
+    """✅ start(기본: 오늘)부터 n일치 날짜 리스트 생성 (한국 시간 기준)"""
+    base = start or datetime.now(KST).date()
+    return [base + timedelta(days=i) for i in range(n)]
 
-def expand_hours(start_hour, duration):
-    return [h for h in range(start_hour, start_hour + duration) if 0 <= h < 24]
+def request_window(default_days=3):
+    """✅ ?start=YYYY-MM-DD&days=N → 표시할 날짜 창 + 이전/다음 페이지 시작일
+
+    start는 오늘 이전으로 갈 수 없고, days는 1~7일로 제한한다.
+    """
+    today = datetime.now(KST).date()
+    n = min(max(request.args.get("days", default_days, type=int), 1), MAX_WINDOW_DAYS)
+    try:
+        start = max(parse_date(request.args.get("start", "")), today)
+    except ValueError:
+        start = today
+
+    days = make_days(n, start)
+    prev_start = max(start - timedelta(days=n), today) if start > today else None
+    next_start = start + timedelta(days=n)
+    return days, prev_start, next_start
+
+def now_kst():
+    """✅ 현재 한국 시각 (DB의 start_at/end_at과 비교하는 naive 값)"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+def parse_date(value):
+    """'YYYY-MM-DD' → date"""
+    return date_cls.fromisoformat(value.strip())
+
+def search_window():
+    """✅ ?date=YYYY-MM-DD&from=14&to=17&hours=2 → (시작, 끝, 연속 시간) — to <= from 이면 다음날 to시까지
+
+    창은 최대 24시간, hours는 1~창 길이로 제한한다.
+    """
+    now = now_kst()
+    try:
+        day = parse_date(request.args.get("date", ""))
+    except ValueError:
+        day = now.date()
+    default_from = min(now.hour + 1, 23) if day == now.date() else 9
+    from_hour = min(max(request.args.get("from", default_from, type=int), 0), 23)
+    to_hour = min(max(request.args.get("to", from_hour + 3, type=int), 0), 24)
+    if to_hour <= from_hour:
+        to_hour += 24
+    length = min(to_hour - from_hour, 24)
+    hours = min(max(request.args.get("hours", 1, type=int), 1), length)
+
+    start = datetime.combine(day, time(from_hour))
+    return start, start + timedelta(hours=length), hours
+
+def report_range():
+    """✅ ?start=YYYY-MM-DD&end=YYYY-MM-DD → (첫날, 마지막날) — 기본: 오늘까지 최근 4주, 최대 366일"""
+    today = datetime.now(KST).date()
+    try:
+        last = parse_date(request.args.get("end", ""))
+    except ValueError:
+        last = today
+    try:
+        first = parse_date(request.args.get("start", ""))
+    except ValueError:
+        first = last - timedelta(days=27)
+    if first > last:
+        first, last = last, first
+    return max(first, last - timedelta(days=MAX_REPORT_DAYS - 1)), last
+
+def upcoming_bookings(leader_id, leader_name, leader_phone=None):
+    """✅ 오늘 이후 시작하는 내 예약 → (단체 목록, 개인 목록) — student_bookings 인덱스 조회 1번"""
+    today = datetime.combine(datetime.now(KST).date(), datetime.min.time())
+    rows = student_bookings(leader_id, today, leader_name=leader_name, leader_phone=leader_phone)
+    return [r for r in rows if r.kind == "group"], [r for r in rows if r.kind == "personal"]
+
+def form_members(leader_id):
+    """✅ 단체 예약 폼의 member_1~5 이름/학번 → [(학번, 이름)...] (빈 칸·대표자·중복 제외)"""
+    members, seen = [], {leader_id}
+    for i in range(1, 6):
+        sid = request.form.get(f"member_{i}_id", "").strip().upper()
+        if sid and sid not in seen:
+            seen.add(sid)
+            members.append((sid, request.form.get(f"member_{i}_name", "").strip()))
+    return members
+
+def conflict_message(e, student_message):
+    """BookingConflict → 사용자 안내 문구"""
+    if e.reason == "student":
+        return f"⚠️ {student_message}"
+    r = e.existing
+    if e.reason == "member":
+        return f"⚠️ 팀원 {r.student_id}님이 같은 시간에 다른 종류(단체/개인) 예약에 포함되어 있습니다."
+    if r is None:
+        return "이미 예약된 시간이 포함되어 있습니다."
+    return f"{r.date}일 {r.hour}시~{r.hour + r.duration}시까지 이미 예약이 있습니다."
+
+def series_outcomes(dates, booked, conflicts, student_message):
+    """반복 예약 회차별 결과 → [(날짜, None(저장됨) 또는 실패 사유)]"""
+    outcomes = []
+    for d in dates:
+        if d in booked:
+            outcomes.append((d, None))
+        elif d in conflicts:
+            outcomes.append((d, conflict_message(BookingConflict(*conflicts[d]), student_message)))
+        else:
+            outcomes.append((d, "동시에 들어온 예약과 겹쳐 저장하지 못했습니다."))
+    return outcomes
 
 def safe_flash(message, category=None):
     session.pop('_flashes', None)
@@ -42,57 +152,33 @@ def hvac_info():
 # -------------------------------
 @app.route("/room_detail")
 def room_detail():
-    room = request.args.get("room", "1")
-    days = make_days(7)
-    hours = hours_24()
-
-    # ✅ 이번 주(7일치) + 다음날 1일 추가로 불러오기 (자정 넘김 표시용)
-    days_with_next = days + [
-        (datetime.strptime(days[-1], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-    ]
-
-    reservations = Reservation.query.filter(
-        Reservation.room == room,
-        Reservation.date.in_(days_with_next)
-    ).all()
-
-    reserved = {d: set() for d in days}
-    owners = {}
+    rooms = list_resources("group")
+    room = request.args.get("room") or (rooms[0].code if rooms else None)
+    resource = next((r for r in rooms if r.code == room), None)
+    if resource is None:
+        abort(404)
+    days, prev_start, next_start = request_window()
+    last_event_id = latest_event_id()  # 이 뒤 변경은 SSE로 받아 반영
+
+    # ✅ 캐시된 예약표 조각 (없으면 비트맵 엔진으로 계산 후 렌더링)
+    def render(occ, resource):
+        return render_template(
+            "group/_room_grid.html",
+            room=resource, days=days, rows=occ.rows(resource)
+        )
 
-    for r in reservations:
-        try:
-            start = int(r.hour)
-            dur = int(r.duration or 1)
-            end = start + dur
-            rname = (r.leader_name or "").strip()
-            rid = (r.leader_id or "").strip().upper()
-            label = f"{rid} {rname}" if rname and rname != rid else rid
-            date_obj = datetime.strptime(r.date, "%Y-%m-%d")
-
-            # ✅ 1) 오늘 날짜 부분
-            for h in range(start, min(end, 24)):
-                if r.date in reserved:
-                    reserved[r.date].add(h)
-                    owners[(r.date, h)] = label
-
-            # ✅ 2) 자정 넘긴 경우 → 다음날 일부 시간 표시
-            if end > 24:
-                next_day = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-                if next_day in reserved:
-                    for h in range(0, end - 24):
-                        reserved[next_day].add(h)
-                        owners[(next_day, h)] = label
-
-        except Exception as e:
-            print("⚠ hour/duration parse error:", e)
+    grid = grid_cache.fetch("group", [room], days, render, namespace="grid")[room]
 
     return render_template(
         "group/room_detail.html",
         room=room,
+        rooms=rooms,
+        resource=resource,
         days=days,
-        hours=hours,
-        reserved=reserved,
-        owners=owners
+        prev_start=prev_start,
+        next_start=next_start,
+        last_event_id=last_event_id,
+        grid_html=grid["html"]
     )
 
 
@@ -106,15 +192,25 @@ def reserve_form():
 @app.route("/reserve", methods=["POST"])
 def reserve_group():
     room = request.form.get("room")
-    date = request.form.get("date")
+    date = parse_date(request.form.get("date"))
     hour = int(request.form.get("hour"))
     duration = int(request.form.get("duration", 1))
 
     leader_name = request.form.get("leader_name", "").strip()
     leader_id = request.form.get("leader_id", "").strip().upper()
     leader_phone = request.form.get("leader_phone", "").strip()
+    members = form_members(leader_id)
+    total_people = max(request.form.get("memberCount", 1, type=int), 1 + len(members))
 
     # ✅ 입력 검증
+    resource = get_resource("group", room)
+    if resource is None:
+        return render_template(
+            "group/simple_msg.html",
+            title="❌ 예약 불가",
+            message="존재하지 않는 프로젝트실입니다.",
+            back_url="/room_detail"
+        )
     if not leader_name or not leader_id or leader_name == leader_id:
         return render_template(
             "group/simple_msg.html",
@@ -122,85 +218,82 @@ def reserve_group():
             message="대표자 이름과 학번을 올바르게 입력해주세요.",
             back_url=f"/room_detail?room={room}"
         )
+    if total_people > resource.capacity:
+        return render_template(
+            "group/simple_msg.html",
+            title="❌ 예약 불가",
+            message=f"{resource.name}은(는) 최대 {resource.capacity}명까지 이용할 수 있습니다.",
+            back_url=f"/room_detail?room={room}"
+        )
 
-    # ✅ 시간 확장 (자정 넘는 경우 다음날로 나누기)
-    from datetime import datetime, timedelta
+    # ✅ 반복 예약 (매주/격주 ~ 종료일): 전 회차 한 번에 검사 → 겹치지 않는 회차만 일괄 저장
+    every_weeks = {"weekly": 1, "biweekly": 2}.get(request.form.get("repeat"))
+    if every_weeks:
+        try:
+            until = parse_date(request.form.get("repeat_until", ""))
+        except ValueError:
+            until = date
+        dates = repeat_dates(date, until, every_weeks)
+        try:
+            booked, conflicts = book_series(
+                "group",
+                dates,
+                hour,
+                duration,
+                members=members,
+                room=room,
+                leader_name=leader_name,
+                leader_id=leader_id,
+                leader_phone=leader_phone,
+                total_people=total_people
+            )
+        except BookingConflict:
+            booked, conflicts = [], {}
+        except InvalidBooking as e:
+            return render_template(
+                "group/simple_msg.html",
+                title="❌ 예약 불가",
+                message=str(e),
+                back_url=f"/room_detail?room={room}"
+            )
+        return render_template(
+            "group/series_result.html",
+            room=room,
+            hour=hour,
+            duration=duration,
+            occurrences=series_outcomes(dates, booked, conflicts, "같은 시간에 본인의 개인석 예약이 있습니다."),
+            booked_count=len(booked),
+            back_url=f"/room_detail?room={room}"
+        )
 
-    date_obj = datetime.strptime(date, "%Y-%m-%d")
-    reserved_slots = []
-    for i in range(duration):
-        current_hour = hour + i
-        if current_hour < 24:
-            reserved_slots.append((date, current_hour))
-        else:
-            next_day = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-            reserved_slots.append((next_day, current_hour - 24))
-
-    # ✅ 개인석 중복 검사 (하루 + 다음날)
-    next_day = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-    overlap_personal = PersonalReservation.query.filter(
-        PersonalReservation.leader_id == leader_id,
-        PersonalReservation.date.in_([date, next_day])
-    ).all()
-
-    for p in overlap_personal:
-        p_start = int(p.hour)
-        p_dur = int(p.duration or 1)
-        for i in range(p_dur):
-            ph = p_start + i
-            p_day = p.date
-            if ph >= 24:
-                p_day = (datetime.strptime(p.date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                ph -= 24
-            if (p_day, ph) in reserved_slots:
-                return render_template(
-                    "error.html",
-                    title="예약 불가",
-                    message="⚠️ 개인석 예약과 시간이 겹칩니다.<br>프로젝트실 예약은 중복 불가합니다.",
-                    back_url=url_for('index')
-                )
-
-    # ✅ 같은 방(room) 중복 예약만 차단 (다른 방은 허용)
-    existing = Reservation.query.filter(
-        Reservation.room == room,  # 🔹 반드시 같은 방만 필터링
-        Reservation.date.in_([date, next_day])
-    ).all()
-
-    for r in existing:
-        r_start = int(r.hour)
-        r_dur = int(r.duration or 1)
-        for i in range(r_dur):
-            rh = r_start + i
-            r_day = r.date
-            if rh >= 24:
-                r_day = (datetime.strptime(r.date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-                rh -= 24
-            if (r_day, rh) in reserved_slots:
-                return render_template(
-                    "group/simple_msg.html",
-                    title="❌ 예약 불가",
-                    message=f"{r.date}일 {r.hour}시~{int(r.hour) + int(r.duration)}시까지 이미 예약이 있습니다.",
-                    back_url=f"/room_detail?room={room}"
-                )
-
-    # ✅ DB 저장
-    new_resv = Reservation(
-        room=room,
-        date=date,
-        hour=str(hour),
-        leader_name=leader_name,
-        leader_id=leader_id,
-        leader_phone=leader_phone,
-        total_people=1,
-        duration=duration
-    )
-    db.session.execute(text("""
-    SELECT setval(
-      pg_get_serial_sequence('reservations', 'id'),
-      COALESCE((SELECT MAX(id) FROM reservations), 1)
-    );"""))
-    db.session.add(new_resv)
-    db.session.commit()
+    # ✅ 예약 + 시간 점유 + 팀원을 한 트랜잭션으로 저장 (겹치면 유일 인덱스가 차단)
+    try:
+        book(
+            "group",
+            members=members,
+            room=room,
+            date=date,
+            hour=hour,
+            leader_name=leader_name,
+            leader_id=leader_id,
+            leader_phone=leader_phone,
+            total_people=total_people,
+            duration=duration
+        )
+    except BookingConflict as e:
+        return render_template(
+            "group/simple_msg.html",
+            title="❌ 예약 불가",
+            message=conflict_message(e, "개인석 예약과 시간이 겹칩니다. 프로젝트실 예약은 중복 불가합니다."),
+            back_url=f"/room_detail?room={room}"
+        )
+    except InvalidBooking as e:
+        return render_template(
+            "group/simple_msg.html",
+            title="❌ 예약 불가",
+            message=str(e),
+            back_url=f"/room_detail?room={room}"
+        )
 
     return render_template(
         "group/simple_msg.html",
@@ -215,82 +308,52 @@ def reserve_group():
 # -------------------------------
 @app.route("/personal_detail")
 def personal_detail():
-    seat = request.args.get("seat", default=1, type=int)
-    days = make_days(3)
-    hours = hours_24()
-
-    # ✅ 이번 주(3일치) + 다음날 1일 추가로 불러오기 (자정 넘김 표시용)
-    days_with_next = days + [
-        (datetime.strptime(days[-1], "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-    ]
-
-    # ✅ 현재 좌석(seat)의 이번 주 예약 모두 불러오기
-    reservations = PersonalReservation.query.filter(
-        PersonalReservation.seat == str(seat),
-        PersonalReservation.date.in_(days_with_next)
-    ).all()
-
-    # ✅ 오늘 기준 표시용 구조
-    reserved = {d: set() for d in days}
-    owners = {}
+    seats = list_resources("personal")
+    seat = request.args.get("seat") or (seats[0].code if seats else None)
+    resource = next((r for r in seats if r.code == seat), None)
+    if resource is None:
+        abort(404)
+    days, prev_start, next_start = request_window()
+    last_event_id = latest_event_id()  # 이 뒤 변경은 SSE로 받아 반영
+
+    # ✅ 캐시된 예약표 조각 (없으면 비트맵 엔진으로 계산 후 렌더링)
+    def render(occ, resource):
+        return render_template(
+            "personal/_seat_grid.html",
+            seat=resource, days=days, rows=occ.rows(resource)
+        )
 
-    for r in reservations:
-        try:
-            start = int(r.hour)
-            dur = int(r.duration or 1)
-            end = start + dur
-            label = f"{(r.leader_id or '').upper()} {(r.leader_name or '').strip()}".strip()
-            date_obj = datetime.strptime(r.date, "%Y-%m-%d")
-
-            # ✅ 1) 오늘 날짜 부분
-            for h in range(start, min(end, 24)):
-                if r.date in reserved:
-                    reserved[r.date].add(h)
-                    owners[(r.date, h)] = label
-
-            # ✅ 2) 자정 넘긴 경우 → 다음날 일부 시간 표시
-            if end > 24:
-                next_day = (date_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-                if next_day in reserved:
-                    for h in range(0, end - 24):
-                        reserved[next_day].add(h)
-                        owners[(next_day, h)] = label
-
-        except Exception as e:
-            print("⚠ personal_detail parse error:", e)
+    grid = grid_cache.fetch("personal", [seat], days, render, namespace="grid")[seat]
 
     return render_template(
         "personal/personal_detail.html",
         seat=seat,
+        seats=seats,
+        resource=resource,
         days=days,
-        hours=hours,
-        reserved=reserved,
-        owners=owners
+        prev_start=prev_start,
+        next_start=next_start,
+        last_event_id=last_event_id,
+        grid_html=grid["html"]
     )
 
 @app.route("/personal_all")
 def personal_all():
     days = make_days(3)
-    hours = hours_24()
-    reservations = PersonalReservation.query.filter(
-        PersonalReservation.date.in_(days),
-        PersonalReservation.seat.in_([str(i) for i in range(1, 8)])
-    ).all()
-
-    seats = {i: {"reserved": {d: set() for d in days}, "owners": {}} for i in range(1, 8)}
-    for r in reservations:
-        try:
-            seat_num, start, dur = int(r.seat), int(r.hour), int(r.duration or 1)
-            label = f"{(r.leader_id or '').upper()} {(r.leader_name or '').strip()}".strip()
-            for h in expand_hours(start, dur):
-                seats[seat_num]["reserved"][r.date].add(h)
-                seats[seat_num]["owners"][(r.date, h)] = label
-        except Exception as e:
-            print("⚠ personal_all parse error:", e)
+    seats = catalog_codes(["personal"])["personal"]
+
+    # ✅ 좌석별 카드 캐시 — 없는 좌석만 한 번의 쿼리로 계산
+    def render(occ, resource):
+        return render_template(
+            "personal/_seat_card.html",
+            seat_num=resource, days=days, rows=occ.rows(resource)
+        )
+
+    grids = grid_cache.fetch("personal", seats, days, render, namespace="card")
 
     return render_template(
         "personal/personal_all.html",
-        days=days, hours=hours, seats=seats
+        cards=[grids[seat]["html"] for seat in seats]
     )
 
 @app.route("/personal_reserve_form")
@@ -303,7 +366,7 @@ def personal_reserve_form():
 @app.route("/personal_reserve", methods=["POST"])
 def personal_reserve():
     seat = request.form.get("seat")
-    date = request.form.get("date")
+    date = parse_date(request.form.get("date"))
     hour = int(request.form.get("hour"))
     duration = int(request.form.get("duration", 1))
     leader_name = request.form.get("leader_name", "").strip()
@@ -311,6 +374,13 @@ def personal_reserve():
     leader_phone = request.form.get("leader_phone", "").strip()
 
     # ✅ 입력 검증
+    if get_resource("personal", seat) is None:
+        return render_template(
+            "personal/simple_msg.html",
+            title="❌ 예약 불가",
+            message="존재하지 않는 개인석입니다.",
+            back_url="/personal_detail"
+        )
     if not leader_name or not leader_id or leader_name == leader_id:
         return render_template(
             "personal/simple_msg.html",
@@ -319,59 +389,33 @@ def personal_reserve():
             back_url=f"/personal_detail?seat={seat}"
         )
 
-    start_hour = hour
-    end_hour = hour + duration
-
-    # ✅ 같은 사용자 단체실 중복 검사 (강화 버전)
-    overlap_group = Reservation.query.filter(
-        Reservation.leader_id == leader_id,
-        Reservation.date == date
-    ).all()
-
-    for g in overlap_group:
-        g_start = int(g.hour)
-        g_end = g_start + int(g.duration or 1)
-        # 겹치거나 딱 맞닿는 경우까지 차단
-        if not (end_hour <= g_start or start_hour >= g_end):
-            return render_template(
-                "error.html",
-                title="예약 불가",
-                message=f"⚠️ 이미 같은 날짜({date})에 프로젝트실 예약이 있습니다.<br>개인석 예약은 중복 불가합니다.",
-                back_url=f"/personal_detail?seat={seat}"
-            )
-
-    # ✅ 같은 개인석 시간대 중복 금지
-    existing = PersonalReservation.query.filter(
-        PersonalReservation.seat == seat,
-        PersonalReservation.date == date
-    ).all()
-
-    target_hours = set(range(hour, hour + duration))
-    for r in existing:
-        s = int(r.hour)
-        d = int(r.duration or 1)
-        exists_hours = set(range(s, s + d))
-        if target_hours & exists_hours:
-            return render_template(
-                "personal/simple_msg.html",
-                title="❌ 예약 불가",
-                message=f"{r.date}일 {r.hour}시~{int(r.hour) + int(r.duration)}시까지 이미 예약이 있습니다.",
-                back_url=f"/personal_detail?seat={seat}"
-            )
-
-    # ✅ DB 저장
-    new_resv = PersonalReservation(
-        seat=seat,
-        date=date,
-        hour=str(hour),
-        leader_name=leader_name,
-        leader_id=leader_id,
-        leader_phone=leader_phone,
-        total_people=1,
-        duration=duration
-    )
-    db.session.add(new_resv)
-    db.session.commit()
+    # ✅ 예약 + 시간 점유를 한 트랜잭션으로 저장 (겹치면 유일 인덱스가 차단)
+    try:
+        book(
+            "personal",
+            seat=seat,
+            date=date,
+            hour=hour,
+            leader_name=leader_name,
+            leader_id=leader_id,
+            leader_phone=leader_phone,
+            total_people=1,
+            duration=duration
+        )
+    except BookingConflict as e:
+        return render_template(
+            "personal/simple_msg.html",
+            title="❌ 예약 불가",
+            message=conflict_message(e, "이미 같은 시간에 프로젝트실 예약이 있습니다. 개인석 예약은 중복 불가합니다."),
+            back_url=f"/personal_detail?seat={seat}"
+        )
+    except InvalidBooking as e:
+        return render_template(
+            "personal/simple_msg.html",
+            title="❌ 예약 불가",
+            message=str(e),
+            back_url=f"/personal_detail?seat={seat}"
+        )
 
     return render_template(
         "personal/simple_msg.html",
@@ -387,25 +431,23 @@ def personal_reserve():
 def extend_page():
     """연장 페이지 — 종료 20분 전부터만 연장 가능 (1차 차단)"""
     now = datetime.now(KST)
-    today = now.strftime("%Y-%m-%d")
 
     if request.method == "POST":
         name = request.form.get("leader_name", "").strip()
         sid = request.form.get("leader_id", "").strip().upper()
+        now_local = now_kst()
 
-        # 현재 시간대에 진행 중인 예약만 탐색
+        # 현재 시간대에 진행 중인 예약만 탐색 (leader_id + end_at 인덱스 범위 검색)
         group = Reservation.query.filter(
-            Reservation.leader_name == name, Reservation.leader_id == sid,
-            Reservation.date == today,
-            cast(Reservation.hour, Integer) <= now.hour,
-            (cast(Reservation.hour, Integer) + cast(Reservation.duration, Integer)) > now.hour
+            Reservation.leader_id == sid, Reservation.leader_name == name,
+            Reservation.end_at > now_local,
+            Reservation.start_at <= now_local
         ).first()
 
         personal = PersonalReservation.query.filter(
-            PersonalReservation.leader_name == name, PersonalReservation.leader_id == sid,
-            PersonalReservation.date == today,
-            cast(PersonalReservation.hour, Integer) <= now.hour,
-            (cast(PersonalReservation.hour, Integer) + cast(PersonalReservation.duration, Integer)) > now.hour
+            PersonalReservation.leader_id == sid, PersonalReservation.leader_name == name,
+            PersonalReservation.end_at > now_local,
+            PersonalReservation.start_at <= now_local
         ).first()
 
         res = group or personal
@@ -414,15 +456,12 @@ def extend_page():
             return redirect(url_for("extend_page"))
 
         # ✅ 종료 시각 계산
-        start_hour = int(res.hour)
-        start_dt = datetime.strptime(
-            f"{res.date} {start_hour}:00", "%Y-%m-%d %H:%M"
-        ).replace(tzinfo=KST)
-        end_dt = start_dt + timedelta(hours=int(res.duration))
+        start_dt = res.start_at.replace(tzinfo=KST)
+        end_dt = res.end_at.replace(tzinfo=KST)
         remaining = int((end_dt - now).total_seconds() // 60)
 
-        # 디버깅 로그
-        print(f"[extend_page] now={now}, start_dt={start_dt}, end_dt={end_dt}, remaining(min)={remaining}")
+        # 디버깅 로그 (DEBUG는 LOG_DEBUG_SAMPLE 비율만 기록)
+        log.debug("extend_page", extra={"reservation_id": res.id, "start": start_dt, "end": end_dt, "remaining_min": remaining})
 
         # ✅ 20분 전이 아니면 연장 불가 (1차 차단)
         if remaining > 20:
@@ -447,7 +486,7 @@ def extend_confirm():
     - 뒤 시간대 겹침 검증
     - 성공 시 extend_success.html / 실패 시 extend_blocked.html
     """
-    res_type = request.form.get("res_type")          # "group" or "personal"
+    res_type = "group" if request.form.get("res_type") == "group" else "personal"
     res_id = request.form.get("res_id", type=int)    # 예약 PK
     extend_hours = int(request.form.get("extend_hours", 0))
 
@@ -461,75 +500,35 @@ def extend_confirm():
     now = datetime.now(KST)
 
     # 현재 예약의 시작/종료, 남은 시간 계산
-    start_hour = int(reservation.hour)
-    duration = int(reservation.duration)
-    start_dt = datetime.strptime(
-        f"{reservation.date} {start_hour}:00", "%Y-%m-%d %H:%M"
-    ).replace(tzinfo=KST)
-    end_dt = start_dt + timedelta(hours=duration)
+    start_dt = reservation.start_at.replace(tzinfo=KST)
+    end_dt = reservation.end_at.replace(tzinfo=KST)
     remaining = int((end_dt - now).total_seconds() // 60)
 
-    # 디버깅 로그
-    print(f"[extend_confirm] now={now}, start_dt={start_dt}, end_dt={end_dt}, remaining(min)={remaining}")
+    # 디버깅 로그 (DEBUG는 LOG_DEBUG_SAMPLE 비율만 기록)
+    log.debug("extend_confirm", extra={"kind": res_type, "reservation_id": res_id, "start": start_dt, "end": end_dt,
+                                       "remaining_min": remaining, "extend_hours": extend_hours})
 
     # ✅ 20분 제한 (2차 차단: 직접 POST 우회 방지)
     if remaining > 20:
         safe_flash("⚠️ 예약 종료 20분 전부터만 연장할 수 있습니다.")
         return redirect(url_for("extend_page"))
 
-    # 연장 구간 (end_dt ~ end_dt + extend_hours)
-    new_start_hour = end_dt.hour
-    new_end_dt = end_dt + timedelta(hours=extend_hours)
-    new_date = new_end_dt.strftime("%Y-%m-%d")
-    old_date = reservation.date
-
-    # 겹침 검사 함수
-    def has_overlap(model, date_str, start_h, dur):
-        if model is Reservation:
-            q = model.query.filter(
-                model.room == reservation.room,
-                model.date == date_str,
-                cast(model.hour, Integer) < start_h + dur,
-                (cast(model.hour, Integer) + cast(model.duration, Integer)) > start_h,
-                model.id != reservation.id
-            )
-        else:
-            q = model.query.filter(
-                model.seat == reservation.seat,
-                model.date == date_str,
-                cast(model.hour, Integer) < start_h + dur,
-                (cast(model.hour, Integer) + cast(model.duration, Integer)) > start_h,
-                model.id != reservation.id
-            )
-        return q.first() is not None
-
-    if extend_hours <= 0:
-        safe_flash("연장 시간이 올바르지 않습니다.")
+    # ✅ 뒤 시간대 겹침 검사 (db.conflicts 구간 비교, 자정 넘김 포함) 후 점유
+    # 날짜는 그대로 두고 duration만 늘림 → 다음날 부분은 자정 넘김으로 표시
+    try:
+        extend(res_type, reservation, extend_hours)
+    except InvalidBooking as e:
+        safe_flash(f"⚠️ {e}")
         return redirect(url_for("extend_page"))
+    except BookingConflict as e:
+        if e.reason == "student":
+            message = "⚠️ 연장 불가: 같은 시간에 본인의 다른 종류(단체/개인) 예약이 있습니다."
+        elif e.reason == "member":
+            message = f"⚠️ 연장 불가: 같은 시간에 {e.existing.student_id}님의 다른 종류(단체/개인) 예약이 있습니다."
+        else:
+            message = "⚠️ 연장 불가: 뒤 시간대에 이미 예약이 있습니다."
+        return render_template("extend_blocked.html", message=message)
 
-    # 자정 넘김 여부
-    crosses_midnight = (new_date != old_date) and (new_start_hour < start_hour)
-
-    # 겹침 검사 대상
-    check_date = old_date if not crosses_midnight else new_date
-    check_start_hour = new_start_hour
-    check_duration = extend_hours
-
-    # 겹침 있으면 차단
-    if has_overlap(Model, check_date, check_start_hour, check_duration):
-        return render_template(
-            "extend_blocked.html",
-            message="⚠️ 연장 불가: 뒤 시간대에 이미 예약이 있습니다."
-        )
-
-    # DB 업데이트 (기존 예약 유지)
-    if crosses_midnight:
-        reservation.date = new_date
-        reservation.duration = duration + extend_hours
-    else:
-        reservation.duration = duration + extend_hours
-
-    db.session.commit()
     return render_template("extend_success.html", extend_hours=extend_hours)
 
 # -------------------------------
@@ -550,21 +549,7 @@ def cancel_all():
         return redirect(url_for("cancel_all"))
 
     # ✅ 오늘 이후 예약만 표시
-    today_str = datetime.now(KST).strftime("%Y-%m-%d")
-
-    group_reservations = Reservation.query.filter(
-        Reservation.leader_name == leader_name,
-        Reservation.leader_id == leader_id,
-        Reservation.leader_phone == leader_phone,
-        Reservation.date >= today_str
-    ).order_by(Reservation.date, cast(Reservation.hour, Integer)).all()
-
-    personal_reservations = PersonalReservation.query.filter(
-        PersonalReservation.leader_name == leader_name,
-        PersonalReservation.leader_id == leader_id,
-        PersonalReservation.leader_phone == leader_phone,
-        PersonalReservation.date >= today_str
-    ).order_by(PersonalReservation.date, cast(PersonalReservation.hour, Integer)).all()
+    group_reservations, personal_reservations = upcoming_bookings(leader_id, leader_name, leader_phone)
 
     # ✅ 결과가 없더라도 결과 페이지에서 안내 메시지 출력
     if not group_reservations and not personal_reservations:
@@ -595,80 +580,30 @@ def cancel_all_confirm():
     leader_id = request.form.get("leader_id", "").strip().upper()
     leader_phone = request.form.get("leader_phone", "").strip()
 
-    if not selected_items:
-        safe_flash("⚠️ 선택된 예약이 없습니다.")
-        today_str = datetime.now(KST).strftime("%Y-%m-%d")
-
-        group_reservations = Reservation.query.filter(
-            Reservation.leader_name == leader_name,
-            Reservation.leader_id == leader_id,
-            Reservation.date >= today_str
-        ).order_by(Reservation.date, cast(Reservation.hour, Integer)).all()
-
-        personal_reservations = PersonalReservation.query.filter(
-            PersonalReservation.leader_name == leader_name,
-            PersonalReservation.leader_id == leader_id,
-            PersonalReservation.date >= today_str
-        ).order_by(PersonalReservation.date, cast(PersonalReservation.hour, Integer)).all()
-
-        return render_template(
-            "cancel_all_result.html",
-            group_reservations=group_reservations,
-            personal_reservations=personal_reservations,
-            leader_name=leader_name,
-            leader_id=leader_id,
-            leader_phone=leader_phone
-        )
+    # ✅ value 형식: "group:3" 또는 "personal:7"
+    selected = {"group": [], "personal": []}
+    for item in selected_items:
+        type_, _, id_str = item.partition(":")
+        if type_ in selected and id_str.isdigit():
+            selected[type_].append(int(id_str))
 
-    group_deleted, personal_deleted = 0, 0
+    # ✅ 현재 목록은 한 번만 조회 → 삭제 결과(RETURNING)를 빼서 남은 목록으로 재사용
+    group_reservations, personal_reservations = upcoming_bookings(leader_id, leader_name)
 
-    for item in selected_items:
-        try:
-            # ✅ value 형식: "group:3" 또는 "personal:7"
-            type_, id_str = item.split(":", 1)
-            target_id = int(id_str)
-
-            if type_ == "group":
-                deleted = Reservation.query.filter_by(
-                    id=target_id,
-                    leader_name=leader_name,
-                    leader_id=leader_id
-                ).delete(synchronize_session=False) or 0
-                group_deleted += deleted
-
-            elif type_ == "personal":
-                deleted = PersonalReservation.query.filter_by(
-                    id=target_id,
-                    leader_name=leader_name,
-                    leader_id=leader_id
-                ).delete(synchronize_session=False) or 0
-                personal_deleted += deleted
-
-        except Exception as e:
-            print("❌ 예약 취소 중 오류:", e)
-
-    db.session.commit()
-    total_deleted = group_deleted + personal_deleted
-
-    if total_deleted > 0:
-        safe_flash(f"✅ 선택한 {total_deleted}개의 예약이 취소되었습니다.")
+    if not any(selected.values()):
+        safe_flash("⚠️ 선택된 예약이 없습니다.")
     else:
-        safe_flash("⚠️ 선택된 예약을 찾을 수 없거나 이미 삭제되었습니다.")
-
-    # ✅ 삭제 후 남은 예약 다시 불러오기 (오늘 이후만)
-    today_str = datetime.now(KST).strftime("%Y-%m-%d")
+        removed = cancel_many(leader_id, leader_name, selected)
+        db.session.commit()
+        total_deleted = sum(len(ids) for ids in removed.values())
 
-    group_reservations = Reservation.query.filter(
-        Reservation.leader_name == leader_name,
-        Reservation.leader_id == leader_id,
-        Reservation.date >= today_str
-    ).order_by(Reservation.date, cast(Reservation.hour, Integer)).all()
+        if total_deleted > 0:
+            safe_flash(f"✅ 선택한 {total_deleted}개의 예약이 취소되었습니다.")
+        else:
+            safe_flash("⚠️ 선택된 예약을 찾을 수 없거나 이미 삭제되었습니다.")
 
-    personal_reservations = PersonalReservation.query.filter(
-        PersonalReservation.leader_name == leader_name,
-        PersonalReservation.leader_id == leader_id,
-        PersonalReservation.date >= today_str
-    ).order_by(PersonalReservation.date, cast(PersonalReservation.hour, Integer)).all()
+        group_reservations = [r for r in group_reservations if r.reservation_id not in removed["group"]]
+        personal_reservations = [r for r in personal_reservations if r.reservation_id not in removed["personal"]]
 
     return render_template(
         "cancel_all_result.html",
@@ -679,10 +614,211 @@ def cancel_all_confirm():
         leader_phone=leader_phone
     )
 
+# -------------------------------
+# 🔹 좌석 현황 API (프론트에서 좌석 전환용)
+# -------------------------------
+@app.route("/api/seat_map")
+def api_seat_map():
+    """모든 개인석 + 프로젝트실의 기간 내 점유 현황 (자정 넘김 포함, 쿼리 1회)
+
+    resources[종류][자원][날짜] = 24칸 배열 (예약자 라벨, 빈 시간은 null)
+    """
+    days, _, _ = request_window()
+    last_event_id = latest_event_id()
+    kinds = catalog_codes()
+    occs = load_occupancies(kinds, days)
+
+    resources = {
+        kind: {
+            r: {d.isoformat(): row for d, row in occs[kind].cells(r).items()}
+            for r in names
+        }
+        for kind, names in kinds.items()
+    }
+    return jsonify(days=[d.isoformat() for d in days], resources=resources, last_event_id=last_event_id)
+
+@app.route("/api/availability")
+def api_availability():
+    """자원별·날짜별 24비트 점유 마스크 (비트 h = h시 예약됨)
+
+    ?kind=group|personal (생략 시 둘 다), ?resource=1,2 (생략 시 전체), ?start, ?days
+    자원 버전으로 만든 ETag (압축 시 W/) → If-None-Match가 맞으면 예약 조회 없이 304
+    (304도 자원 목록 + 종류별 resource_versions 인덱스 조회 몇 번은 함)
+    """
+    days, _, _ = request_window()
+    kinds = catalog_codes()
+    if request.args.get("kind") in kinds:
+        kinds = {request.args["kind"]: kinds[request.args["kind"]]}
+    wanted = request.args.get("resource")
+    if wanted:
+        names = [r.strip() for r in wanted.split(",") if r.strip()]
+        kinds = {kind: [r for r in names if r in allowed] for kind, allowed in kinds.items()}
+
+    versions = {kind: current_versions(kind, names) for kind, names in kinds.items()}
+    etag = versions_etag(days, versions)
+    if request.if_none_match.contains_weak(etag):
+        resp = app.response_class(status=304)
+    else:
+        occs = load_occupancies(kinds, days)
+        resp = jsonify(
+            days=[d.isoformat() for d in days],
+            masks={
+                kind: {r: list(occs[kind].masks(r).values()) for r in names}
+                for kind, names in kinds.items()
+            }
+        )
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True
+    return resp
+
+# -------------------------------
+# 🔹 빈 자리 검색 (전체 자원)
+# -------------------------------
+def search_results():
+    """요청 조건 → (조건 dict, [FreeResource]) — 자원 목록 + 창 안 예약 쿼리 2번"""
+    start, end, hours = search_window()
+    kind = request.args.get("kind") if request.args.get("kind") in ("group", "personal") else None
+    building = request.args.get("building", "").strip() or None
+    people = request.args.get("people", type=int)
+    found = free_resources(start, end, hours, kind=kind, building=building, min_capacity=people)
+    params = {"start": start, "end": end, "hours": hours, "kind": kind, "building": building, "people": people}
+    return params, found
+
+@app.route("/search")
+def search():
+    """창(날짜 from~to시) 안에서 연속 N시간 비어 있는 방/좌석 찾기"""
+    params, found = search_results()
+    return render_template("search.html", params=params, results=found, buildings=buildings())
+
+@app.route("/api/free_resources")
+def api_free_resources():
+    """?date&from&to&hours&kind&building&people → 예약 가능한 자원과 가능한 시작 시각"""
+    params, found = search_results()
+    return jsonify(
+        window={"start": params["start"].isoformat(), "end": params["end"].isoformat(), "hours": params["hours"]},
+        free=[
+            {
+                "kind": f.resource.kind,
+                "code": f.resource.code,
+                "name": f.resource.name,
+                "building": f.resource.building,
+                "floor": f.resource.floor,
+                "capacity": f.resource.capacity,
+                "starts": [s.isoformat() for s in f.starts],
+            }
+            for f in found
+        ]
+    )
+
+# -------------------------------
+# 🔹 이용률 리포트 (관리자)
+# -------------------------------
+def report_kind():
+    return request.args.get("kind") if request.args.get("kind") in ("group", "personal") else None
+
+@app.route("/admin/utilization")
+def admin_utilization():
+    """자원별 이용률 — 시간대별 / 주별 (utilization_hours 집계만 읽음)"""
+    first, last = report_range()
+    kind = report_kind()
+    return render_template(
+        "utilization.html",
+        first=first,
+        last=last,
+        kind=kind,
+        report=utilization_report(first, last, kind)
+    )
+
+@app.route("/admin/utilization.csv")
+def admin_utilization_csv():
+    """?view=week(기본)|hour — 이용률 CSV (엑셀에서 한글이 깨지지 않도록 BOM 포함)"""
+    first, last = report_range()
+    view = "hour" if request.args.get("view") == "hour" else "week"
+    report = utilization_report(first, last, report_kind())
+
+    out = io.StringIO()
+    out.write("\ufeff")
+    writer = csv.writer(out)
+    if view == "hour":
+        writer.writerow(["kind", "code", "name", "building", "hour", "booked_hours", "days", "utilization"])
+        days = (last - first).days + 1
+        for r in report:
+            for h, booked, rate in r["by_hour"]:
+                writer.writerow([r["kind"], r["code"], r["name"], r["building"], h, booked, days, f"{rate:.4f}"])
+    else:
+        writer.writerow(["kind", "code", "name", "building", "week_start", "booked_hours", "available_hours", "utilization"])
+        for r in report:
+            for monday, booked, available, rate in r["by_week"]:
+                writer.writerow([r["kind"], r["code"], r["name"], r["building"], monday, booked, available, f"{rate:.4f}"])
+
+    return app.response_class(
+        out.getvalue(),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=utilization_{view}_{first}_{last}.csv"}
+    )
+
+# -------------------------------
+# 🔹 실시간 갱신 (SSE / 롱폴링)
+# -------------------------------
+def event_target():
+    kind = "group" if request.args.get("kind") == "group" else "personal"
+    return kind, request.args.get("resource", "1")
+
+def streams_busy():
+    """워커의 스트림 자리가 다 찼을 때 — 브라우저는 /api/availability 폴링으로 전환"""
+    resp = jsonify(error="streams_busy", fallback="/api/availability")
+    resp.status_code = 503
+    resp.headers["Retry-After"] = "60"
+    return resp
+
+@app.route("/events")
+def events():
+    """(종류, 자원)의 시간 단위 변경을 SSE로 전송 (워커당 동시 스트림 수 제한, 초과 시 503)"""
+    kind, resource = event_target()
+    after = request.headers.get("Last-Event-ID", type=int) or request.args.get("after", type=int)
+    body = event_bus.open_stream(kind, resource, after)
+    if body is None:
+        return streams_busy()
+    return app.response_class(
+        body,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/events/poll")
+def events_poll():
+    """SSE를 못 쓰는 환경용 롱폴링 (?after=마지막 이벤트 id)"""
+    kind, resource = event_target()
+    after = request.args.get("after", type=int)
+    timeout = request.args.get("timeout", 25, type=float)
+    timeout = 25 if math.isnan(timeout) else min(max(timeout, 0), 30)  # queue.get은 음수/NaN 불가
+    found = event_bus.wait(kind, resource, after, timeout)
+    if found is None:
+        return streams_busy()
+    return jsonify(events=found, last_id=found[-1]["id"] if found else after)
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus 텍스트 형식 요청 계측값 (워커별)"""
+    stats = grid_cache.stats()
+    body = app.extensions["metrics"].render_prometheus({
+        "studyroom_grid_cache_hits_total": ("예약표 캐시 적중", stats["hits"]),
+        "studyroom_grid_cache_misses_total": ("예약표 캐시 미스", stats["misses"]),
+    })
+    return app.response_class(body, mimetype="text/plain; version=0.0.4")
+
+@app.route("/cache_stats")
+def cache_stats():
+    return jsonify(grid_cache.stats())
+
 @app.route("/cancel_all_result")
 def cancel_all_result():
     return render_template("cancel_all_result.html")
 
 # ---------------- 실행 ----------------
 if __name__ == "__main__":
+    # 로컬 직접 실행 시에만 스키마 준비 (배포는 init-db / gunicorn.conf.py)
+    from db.schema import init_schema
+    with app.app_context():
+        init_schema()
     app.run(debug=True)
@@ -0,0 +1,119 @@
+"""✅ 보관(hot/cold 분리) 전후 예약표·예약 지연 비교 — 이력 1개월 / 12개월
+
+    python -m bench.archive --months 1 12 --samples 300
+
+이력 길이마다 DB를 새로 만들고 (bench.seed, 앞으로 4주 포함) 보관 전 → archive_before() → 보관 후 순으로
+- grid: 전체 방/좌석의 3일 점유 조회 (load_occupancies, 예약표/좌석 지도와 같은 쿼리)
+- booking: 앞으로 4주 중 빈 시간에 개인석 예약 → 일괄 취소 (book + cancel_many)
+- upcoming: "오늘 이후 내 예약" 조회 (student_bookings)
+를 측정한다. DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+from bench.common import bootstrap_app, summarize, timed
+from bench.seed import SEED_ROOMS, SEED_SEATS, seed_semester, student
+
+FUTURE_WEEKS = 4
+
+
+def live_bytes():
+    """live 예약 테이블 + 인덱스가 차지하는 바이트 (SQLite dbstat / Postgres pg_total_relation_size)"""
+    from db import db
+    from db.conflicts import MODELS
+    tables = [Model.__table__ for Model in MODELS.values()]
+    if db.engine.dialect.name == "postgresql":
+        return sum(db.session.execute(db.text(f"SELECT pg_total_relation_size('{t.name}')")).scalar() for t in tables)
+    names = [t.name for t in tables] + [i.name for t in tables for i in t.indexes]
+    try:
+        return db.session.execute(
+            db.text(f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({', '.join(repr(n) for n in names)})")
+        ).scalar()
+    except Exception:  # dbstat 없이 빌드된 SQLite
+        db.session.rollback()
+        return None
+
+
+def measure(today, samples, students, rng):
+    from db import db
+    from db.booking import BookingConflict, book, cancel_many, student_bookings
+    from db.occupancy import load_occupancies
+
+    grid, booking, upcoming, skipped = [], [], [], 0
+    for _ in range(samples):
+        start = today + timedelta(days=rng.randrange(FUTURE_WEEKS * 7 - 3))
+        days = [start + timedelta(days=i) for i in range(3)]
+        _, seconds = timed(load_occupancies, {"group": SEED_ROOMS, "personal": SEED_SEATS}, days)
+        grid.append(seconds)
+
+        sid, name, phone = student(students + rng.randrange(100))
+        try:
+            def book_and_cancel():
+                r = book("personal", seat=rng.choice(SEED_SEATS), date=start, hour=rng.randrange(24), duration=1,
+                         leader_name=name, leader_id=sid, leader_phone=phone, total_people=1)
+                cancel_many(sid, name, {"personal": [r.id]})
+                db.session.commit()
+            _, seconds = timed(book_and_cancel)
+            booking.append(seconds)
+        except BookingConflict:
+            skipped += 1
+
+        sid, name, phone = student(rng.randrange(students))
+        since = datetime.combine(today, datetime.min.time())
+        _, seconds = timed(student_bookings, sid, since, name, phone)
+        upcoming.append(seconds)
+
+    return {
+        "grid": summarize(grid),
+        "booking": dict(summarize(booking), skipped_conflicts=skipped),
+        "upcoming": summarize(upcoming),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--months", type=int, nargs="+", default=[1, 12])
+    p.add_argument("--retention-days", type=int, default=30)
+    p.add_argument("--students", type=int, default=2000)
+    p.add_argument("--busy", type=float, default=0.35)
+    p.add_argument("--samples", type=int, default=300)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out")
+    args = p.parse_args()
+
+    app_module = bootstrap_app()
+    today = app_module.make_days(1)[0]
+    report = {}
+
+    with app_module.app.app_context():
+        from db import db
+        from db.archive import archive_before, archive_cutoff, table_counts
+        from db.schema import init_schema
+
+        for months in args.months:
+            db.drop_all()
+            init_schema()
+            weeks = round(months * 52 / 12) + FUTURE_WEEKS
+            seed_semester(weeks, args.students, args.busy, seed=args.seed, today=today)
+
+            rng = random.Random(args.seed)
+            result = {"before": dict(rows=table_counts(), live_bytes=live_bytes(),
+                                     **measure(today, args.samples, args.students, rng))}
+            moved, seconds = timed(archive_before, archive_cutoff(today, args.retention_days))
+            result["archive_job"] = dict(moved, seconds=round(seconds, 3))
+            rng = random.Random(args.seed)  # 보관 전과 같은 요청 순서
+            result["after"] = dict(rows=table_counts(), live_bytes=live_bytes(),
+                                   **measure(today, args.samples, args.students, rng))
+            report[f"{months}_months"] = result
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
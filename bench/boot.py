@@ -0,0 +1,96 @@
+"""✅ 워커 부팅 시간 / 첫 요청까지 시간 벤치마크
+
+    python -m bench.boot --runs 10 [--out boot.json]
+
+- cold: 새 프로세스에서 import app (preload 없는 gunicorn 워커와 같음) → 첫 요청
+- preload: 앱을 import 한 부모에서 fork (gunicorn preload_app) → 연결 예열 → 첫 요청
+import 중 실행된 SQL 수도 같이 기록한다 (0이어야 함).
+DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from bench.common import bootstrap_app, summarize
+
+COLD_SCRIPT = r"""
+import json, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+queries = []
+event.listen(Engine, "before_cursor_execute", lambda *a: queries.append(1))
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+import_queries = len(queries)
+app.app.test_client().get("/room_detail?room=1")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": t2 - t1, "import_queries": import_queries}))
+"""
+
+
+def cold_boot(runs):
+    imports, firsts, queries = [], [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", COLD_SCRIPT], capture_output=True, text=True,
+                             check=True, env=dict(os.environ, LOG_LEVEL="WARNING"))
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(result["import"])
+        firsts.append(result["first_request"])
+        queries.append(result["import_queries"])
+    return {"import": summarize(imports), "first_request": summarize(firsts), "import_queries": max(queries)}
+
+
+def preload_boot(app_module, runs):
+    from db import db
+    from db.engine import warm_up
+
+    app = app_module.app
+    with app.app_context():
+        db.engine.dispose()
+    boots, firsts = [], []
+    for _ in range(runs):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # 자식 = gunicorn 워커 (post_fork 와 같은 순서)
+            os.close(read_fd)
+            t0 = time.perf_counter()
+            with app.app_context():
+                db.engine.dispose(close=False)
+            warm_up(app)
+            t1 = time.perf_counter()
+            app.test_client().get("/room_detail?room=1")
+            t2 = time.perf_counter()
+            os.write(write_fd, json.dumps([t1 - t0, t2 - t1]).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            boot, first = json.loads(f.read())
+        os.waitpid(pid, 0)
+        boots.append(boot)
+        firsts.append(first)
+    return {"fork_and_warm": summarize(boots), "first_request": summarize(firsts)}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--runs", type=int, default=10)
+    p.add_argument("--out")
+    args = p.parse_args()
+
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    app_module = bootstrap_app()  # DATABASE_URL 고정 + 스키마 준비 (자식 프로세스도 같은 DB 사용)
+    results = {"cold": cold_boot(args.runs), "preload": preload_boot(app_module, args.runs)}
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""✅ 벤치마크 공통 — 앱 부트스트랩 / 타이밍 / 통계"""
+import os
+import statistics
+import tempfile
+import time
+
+
+def bootstrap_app():
+    """DATABASE_URL 미설정 시 임시 SQLite 파일로 앱을 띄우고 스키마 준비 → app 모듈"""
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    import app as app_module
+    from db.schema import init_schema
+    with app_module.app.app_context():
+        init_schema()
+    return app_module
+
+
+def register_resources(kind, codes):
+    """벤치 전용 방/좌석 코드를 자원 목록에 등록 (목록에 없는 코드는 예약 경로가 거절함)"""
+    from db import db
+    from db.resources import DEFAULT_BUILDING, upsert_resource
+    for code in codes:
+        upsert_resource(kind, code, building=DEFAULT_BUILDING, capacity=6 if kind == "group" else 1)
+    db.session.commit()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(latencies, wall=None, errors=0):
+    """초 단위 지연 목록 → ms 통계 dict"""
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    wall = wall if wall is not None else sum(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000, 3),
+            "p50": round(statistics.median(latencies) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+    }
+
+
+def timed(fn, *args, **kwargs):
+    """(결과, 경과 초)"""
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
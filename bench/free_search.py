@@ -0,0 +1,130 @@
+"""✅ 빈 자리 검색 벤치마크 (자원 500개)
+
+    python -m bench.free_search --rooms 100 --seats 400 --days 14 --searches 300
+
+- per_resource: 자원마다 창 안 예약을 따로 조회해 겹침 검사 (자원 수만큼 쿼리 — 페이지를 하나씩 여는 것과 같음)
+- bitmap_scan: db.resources.free_resources — 자원 목록 1번 + 창 안 예약 UNION ALL 1번 + 비트 연산
+두 방식의 결과가 같은지도 확인한다. DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import random
+from datetime import datetime, time, timedelta
+
+from bench.common import bootstrap_app, summarize, timed
+from bench.seed import day_bookings, student
+
+BUILDINGS = ["공학관", "제2공학관", "중앙도서관", "학생회관", "정보관"]
+
+
+def seed_catalog(rooms, seats):
+    """자원 rooms + seats 개를 건물/층에 고르게 배치 → 추가한 수"""
+    from db import db
+    from db.resources import upsert_resource
+    for kind, count, prefix, capacity in (("group", rooms, "R", (4, 6, 8, 10)), ("personal", seats, "S", (1,))):
+        for i in range(count):
+            upsert_resource(kind, f"{prefix}{i:03d}", name=f"{prefix}{i:03d}",
+                            building=BUILDINGS[i % len(BUILDINGS)], floor=1 + i // len(BUILDINGS) % 5,
+                            capacity=capacity[i % len(capacity)], sort_order=i)
+    db.session.commit()
+    return rooms + seats
+
+
+def seed_bookings(codes, days, busy, students, rng, today):
+    """자원마다 days 일치 겹치지 않는 예약 생성 → 건수"""
+    from db import db
+    from db.models import Reservation, PersonalReservation
+    count = 0
+    for day_offset in range(days):
+        date = today + timedelta(days=day_offset)
+        rows = []
+        for kind, code in codes:
+            Model, column = (Reservation, "room") if kind == "group" else (PersonalReservation, "seat")
+            for hour, duration in day_bookings(rng, busy):
+                sid, name, phone = student(rng.randrange(students))
+                rows.append(Model(**{column: code}, date=date, hour=hour, duration=duration, total_people=1,
+                                  leader_id=sid, leader_name=name, leader_phone=phone))
+        db.session.add_all(rows)
+        db.session.commit()
+        count += len(rows)
+    return count
+
+
+def per_resource(start, end, duration, kind, building, people):
+    """자원마다 쿼리 1번씩 → [(종류, 코드, 시작 목록)]"""
+    from db.conflicts import resource_intervals
+    from db.resources import list_resources
+    hours = int((end - start) // timedelta(hours=1))
+    found = []
+    for r in list_resources(kind, building, people):
+        index = resource_intervals(r.kind, r.code, start, end)
+        starts = [
+            start + timedelta(hours=i) for i in range(hours - duration + 1)
+            if not index.overlapping(start + timedelta(hours=i), start + timedelta(hours=i + duration))
+        ]
+        if starts:
+            found.append((r.kind, r.code, starts))
+    return found
+
+
+def bitmap_scan(start, end, duration, kind, building, people):
+    from db.resources import free_resources
+    return [(f.resource.kind, f.resource.code, f.starts)
+            for f in free_resources(start, end, duration, kind, building, people)]
+
+
+def random_search(rng, today, days):
+    day = today + timedelta(days=rng.randrange(days))
+    from_hour = rng.randrange(8, 22)
+    length = rng.choice((3, 4, 6, 8))
+    start = datetime.combine(day, time(from_hour))
+    return (start, start + timedelta(hours=length), rng.randint(1, 3),
+            rng.choice((None, None, "group", "personal")), rng.choice((None, None, *BUILDINGS)),
+            rng.choice((None, None, 4, 8)))
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rooms", type=int, default=100)
+    p.add_argument("--seats", type=int, default=400)
+    p.add_argument("--days", type=int, default=14)
+    p.add_argument("--busy", type=float, default=0.5)
+    p.add_argument("--students", type=int, default=5000)
+    p.add_argument("--searches", type=int, default=300)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out")
+    args = p.parse_args()
+
+    app_module = bootstrap_app()
+    today = app_module.make_days(1)[0]
+    rng = random.Random(args.seed)
+    results = {}
+
+    with app_module.app.app_context():
+        from db.resources import list_resources
+        seed_catalog(args.rooms, args.seats)
+        codes = [(r.kind, r.code) for r in list_resources()]
+        seeded, seed_s = timed(seed_bookings, codes, args.days, args.busy, args.students, rng, today)
+        searches = [random_search(rng, today, args.days) for _ in range(args.searches)]
+
+        answers = {}
+        for name, fn in (("per_resource", per_resource), ("bitmap_scan", bitmap_scan)):
+            latencies, found, answers[name] = [], 0, []
+            for params in searches:
+                result, seconds = timed(fn, *params)
+                latencies.append(seconds)
+                found += len(result)
+                answers[name].append(result)
+            results[name] = dict(summarize(latencies), resources_found=found)
+        results["same_results"] = answers["per_resource"] == answers["bitmap_scan"]
+
+    report = {"resources": len(codes), "seeded_rows": seeded, "seed_s": round(seed_s, 2), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
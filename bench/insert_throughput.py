@@ -0,0 +1,97 @@
+"""✅ 단체실 예약 INSERT 처리량 벤치마크 (동시 POST /reserve)
+
+    python -m bench.insert_throughput --workers 8 --per-worker 50
+
+DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+--legacy-setval 은 예약마다 setval(MAX(id))를 실행하던 이전 경로를 재현 (Postgres 전용).
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from bench.common import bootstrap_app, register_resources, summarize
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--per-worker", type=int, default=50)
+    p.add_argument("--legacy-setval", action="store_true")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    app_module = bootstrap_app()
+    app = app_module.app
+
+    from sqlalchemy import text
+    from db import db
+    import db.booking as booking
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        register_resources("group", [f"bench-{w}" for w in range(args.workers)])
+    if args.legacy_setval:
+        if dialect != "postgresql":
+            sys.exit("--legacy-setval 은 Postgres에서만 실행할 수 있습니다.")
+        book = booking.book
+
+        def book_with_setval(kind, **fields):
+            db.session.execute(text("""
+                SELECT setval(pg_get_serial_sequence('reservations', 'id'),
+                              COALESCE((SELECT MAX(id) FROM reservations), 1))"""))
+            return book(kind, **fields)
+
+        booking.book = book_with_setval
+        app_module.book = book_with_setval
+
+    base = datetime.now() + timedelta(days=30)
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(w):
+        client = app.test_client()
+        for i in range(args.per_worker):
+            slot = base + timedelta(hours=i)
+            form = {
+                "room": f"bench-{w}",
+                "date": slot.strftime("%Y-%m-%d"),
+                "hour": str(slot.hour),
+                "duration": "1",
+                "leader_name": f"벤치{w}",
+                "leader_id": f"B{w:06d}",
+                "leader_phone": "010-0000-0000",
+            }
+            t0 = time.perf_counter()
+            resp = client.post("/reserve", data=form)
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                if resp.status_code != 200 or "예약 완료" not in resp.get_data(as_text=True):
+                    errors.append(resp.status_code)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(args.workers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    stats = summarize(latencies, wall, len(errors))
+    stats["inserts_per_s"] = round((len(latencies) - len(errors)) / wall, 2)
+    print(json.dumps({
+        "benchmark": "insert_throughput",
+        "mode": "legacy_setval" if args.legacy_setval else "sequence",
+        "dialect": dialect,
+        "workers": args.workers,
+        **stats,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
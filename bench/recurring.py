@@ -0,0 +1,91 @@
+"""✅ 반복 예약 벤치마크 — 회차마다 book() vs book_series() 일괄 처리
+
+    python -m bench.recurring --series 200 --weeks 16
+
+같은 학기 데이터(bench.seed) 위에서 무작위 (방, 요일·시각, 길이) 반복 예약을 두 방식으로 넣고
+시리즈 1건당 지연·쿼리 수와 저장/충돌 회차 수를 비교한다. DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import random
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from bench.common import bootstrap_app, summarize, timed
+from bench.seed import SEED_ROOMS, seed_semester, student
+
+
+def one_by_one(dates, hour, duration, fields):
+    """회차마다 book() 한 번 (검사 + 커밋) → 저장 수"""
+    from db.booking import BookingConflict, book
+    booked = 0
+    for d in dates:
+        try:
+            book("group", date=d, hour=hour, duration=duration, **fields)
+            booked += 1
+        except BookingConflict:
+            pass
+    return booked
+
+
+def batched(dates, hour, duration, fields):
+    from db.booking import book_series
+    booked, _ = book_series("group", dates, hour, duration, **fields)
+    return len(booked)
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--series", type=int, default=200)
+    p.add_argument("--weeks", type=int, default=16, help="시리즈 길이 (주)")
+    p.add_argument("--students", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out")
+    args = p.parse_args()
+
+    app_module = bootstrap_app()
+    today = app_module.make_days(1)[0]
+    results = {}
+
+    with app_module.app.app_context():
+        from db import db
+        from db.booking import repeat_dates
+        seeded, seed_s = timed(seed_semester, args.weeks + 4, args.students, seed=args.seed, today=today)
+
+        queries = [0]
+        event.listen(db.engine, "before_cursor_execute", lambda *a: queries.__setitem__(0, queries[0] + 1))
+
+        for name, fn in (("book_each_occurrence", one_by_one), ("book_series", batched)):
+            rng = random.Random(args.seed)  # 두 방식에 같은 시리즈 목록
+            latencies, booked, before = [], 0, queries[0]
+            for i in range(args.series):
+                first = today + timedelta(days=rng.randrange(7))
+                dates = repeat_dates(first, first + timedelta(weeks=args.weeks - 1), 1)
+                sid, sname, phone = student(args.students + i)
+                fields = dict(room=rng.choice(SEED_ROOMS), leader_id=sid, leader_name=sname,
+                              leader_phone=phone, total_people=1)
+                count, seconds = timed(fn, dates, rng.randrange(8, 22), rng.choice((1, 2, 3)), fields)
+                latencies.append(seconds)
+                booked += count
+            results[name] = dict(summarize(latencies), occurrences_booked=booked,
+                                 queries_per_series=round((queries[0] - before) / args.series, 1))
+            db.session.rollback()
+            # 다음 방식이 같은 상태에서 시작하도록 이번에 넣은 시리즈 예약 제거
+            from db.models import Reservation, SlotClaim, StudentBooking
+            ids = [r.id for r in Reservation.query.filter(Reservation.leader_id >= student(args.students)[0])]
+            for Table, column in ((SlotClaim, SlotClaim.reservation_id), (StudentBooking, StudentBooking.reservation_id)):
+                Table.query.filter(Table.kind == "group", column.in_(ids)).delete(synchronize_session=False)
+            Reservation.query.filter(Reservation.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+    report = {"seeded_rows": seeded, "seed_s": round(seed_s, 2), "series_weeks": args.weeks, "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""✅ 예약 핫패스 벤치마크 스위트
+
+    python -m bench.run --weeks 16 --iterations 200 --out bench_result.json
+
+한 학기 데이터를 시드한 뒤 room_detail / personal_all / reserve_group / personal_reserve /
+extend_confirm / cancel_all 의 지연 백분위·처리량과, 같은 시간대를 동시에 노리는
+예약 경쟁 시나리오의 이중 예약 수를 JSON으로 출력한다. (DATABASE_URL 미설정 시 임시 SQLite)
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from bench.common import bootstrap_app, register_resources, summarize, timed
+from bench.seed import seed_semester, student
+
+DOUBLE_BOOKING_SQL = {
+    "group": """
+        SELECT COUNT(*) FROM reservations a JOIN reservations b
+          ON a.room = b.room AND a.id < b.id
+         AND a.start_at < b.end_at AND b.start_at < a.end_at""",
+    "personal": """
+        SELECT COUNT(*) FROM personal_reservations a JOIN personal_reservations b
+          ON a.seat = b.seat AND a.id < b.id
+         AND a.start_at < b.end_at AND b.start_at < a.end_at""",
+}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="예약 핫패스 벤치마크")
+    p.add_argument("--weeks", type=int, default=16)
+    p.add_argument("--students", type=int, default=2000)
+    p.add_argument("--iterations", type=int, default=200)
+    p.add_argument("--contenders", type=int, default=16, help="동시 예약 경쟁 스레드 수")
+    p.add_argument("--rounds", type=int, default=20, help="동시 예약 경쟁 라운드 수")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out", help="결과 JSON 파일 (생략 시 stdout)")
+    return p.parse_args()
+
+
+def ok_page(resp, marker=None):
+    return resp.status_code == 200 and (marker is None or marker in resp.get_data(as_text=True))
+
+
+def measure(iterations, request):
+    """request(i) → 성공 여부. 순차 실행 지연 통계"""
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for i in range(iterations):
+        ok, elapsed = timed(request, i)
+        latencies.append(elapsed)
+        errors += 0 if ok else 1
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+class FrozenClock:
+    """extend_confirm의 '종료 20분 전' 조건을 맞추려고 app 모듈의 datetime.now만 고정"""
+
+    def __init__(self, app_module, now):
+        self.app_module = app_module
+        self.real = app_module.datetime
+        real = self.real
+
+        class Frozen(real):
+            @classmethod
+            def now(cls, tz=None):
+                return now.astimezone(tz) if tz else now.replace(tzinfo=None)
+
+        self.frozen = Frozen
+
+    def __enter__(self):
+        self.app_module.datetime = self.frozen
+
+    def __exit__(self, *exc):
+        self.app_module.datetime = self.real
+
+
+def run_suite(args):
+    app_module = bootstrap_app()
+    app = app_module.app
+    from db import db
+    from db.booking import book
+
+    rng = random.Random(args.seed)
+    today = app_module.make_days(1)[0]
+    results = {}
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        seeded, seed_s = timed(seed_semester, args.weeks, args.students, seed=args.seed, today=today)
+
+    client = app.test_client()
+    n = args.iterations
+
+    # ---------------- 조회 ----------------
+    results["room_detail"] = measure(n, lambda i: ok_page(client.get(f"/room_detail?room={1 + i % 2}")))
+    results["room_detail_uncached"] = measure(n, lambda i: ok_page(client.get(
+        f"/room_detail?room={1 + i % 2}&start={today + timedelta(days=i % 28)}&days=7")))
+    results["personal_all"] = measure(n, lambda i: ok_page(client.get("/personal_all")))
+
+    # ---------------- 예약 ----------------
+    # 벤치 전용 방/좌석 등록 (조회 측정이 끝난 뒤 — personal_all 카드 수가 바뀌지 않도록)
+    with app.app_context():
+        register_resources("group", ["bench"] + [f"race-{r}" for r in range(args.rounds)])
+        register_resources("personal", ["bench"] + [f"extend-{i}" for i in range(n)])
+    far = today + timedelta(days=365)
+
+    def reserve_group(i):
+        slot = datetime.combine(far, datetime.min.time()) + timedelta(hours=3 * i)
+        sid, name, phone = student(100000 + i)
+        return ok_page(client.post("/reserve", data={
+            "room": "bench", "date": slot.date().isoformat(), "hour": slot.hour, "duration": 2,
+            "leader_name": name, "leader_id": sid, "leader_phone": phone}), "예약 완료")
+
+    def personal_reserve(i):
+        slot = datetime.combine(far, datetime.min.time()) + timedelta(hours=2 * i)
+        sid, name, phone = student(200000 + i)
+        return ok_page(client.post("/personal_reserve", data={
+            "seat": "bench", "date": slot.date().isoformat(), "hour": slot.hour, "duration": 1,
+            "leader_name": name, "leader_id": sid, "leader_phone": phone}), "예약 완료")
+
+    results["reserve_group"] = measure(n, reserve_group)
+    results["personal_reserve"] = measure(n, personal_reserve)
+
+    # ---------------- 연장 ----------------
+    # 현재 시각을 "다음 정각 10분 전"으로 고정하고, 그 정각에 끝나는 예약을 연장
+    now = datetime.now(app_module.KST).replace(minute=50, second=0, microsecond=0)
+    end = now + timedelta(minutes=10)
+    with app.app_context():
+        targets = []
+        for i in range(n):
+            sid, name, phone = student(300000 + i)
+            r = book("personal", seat=f"extend-{i}", date=now.date(), hour=now.hour, duration=1,
+                     total_people=1, leader_id=sid, leader_name=name, leader_phone=phone)
+            targets.append(r.id)
+    assert end.minute == 0
+    with FrozenClock(app_module, now):
+        results["extend_confirm"] = measure(n, lambda i: ok_page(client.post("/extend_confirm", data={
+            "res_type": "personal", "res_id": targets[i], "extend_hours": 1}), "연장"))
+
+    # ---------------- 취소 목록 ----------------
+    def cancel_all(i):
+        sid, name, phone = student(rng.randrange(args.students))
+        return ok_page(client.post("/cancel_all", data={
+            "leader_name": name, "leader_id": sid, "leader_phone": phone}))
+
+    results["cancel_all"] = measure(n, cancel_all)
+
+    # ---------------- 동시 예약 경쟁 ----------------
+    results["concurrent_booking"] = concurrent_booking(app, far + timedelta(days=60), args)
+
+    with app.app_context():
+        double = {kind: db.session.execute(text(sql)).scalar() for kind, sql in DOUBLE_BOOKING_SQL.items()}
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_rev": git_rev(),
+            "python": platform.python_version(),
+            "dialect": dialect,
+            "weeks": args.weeks,
+            "seeded_rows": seeded,
+            "seed_s": round(seed_s, 2),
+            "iterations": n,
+        },
+        "results": results,
+        "double_bookings": double,
+    }
+
+
+def concurrent_booking(app, date, args):
+    """contenders개 스레드가 라운드마다 같은 방·겹치는 시간을 동시에 예약"""
+    barrier = threading.Barrier(args.contenders)
+    successes, latencies, lock = [], [], threading.Lock()
+
+    def contender(c):
+        client = app.test_client()
+        rng = random.Random(args.seed + c)
+        for r in range(args.rounds):
+            sid, name, phone = student(400000 + c)
+            form = {
+                "room": f"race-{r}", "date": date.isoformat(), "hour": 10 + rng.randint(0, 2),
+                "duration": rng.randint(1, 3), "leader_name": name, "leader_id": sid, "leader_phone": phone,
+            }
+            barrier.wait()
+            resp, elapsed = timed(client.post, "/reserve", data=form)
+            with lock:
+                latencies.append(elapsed)
+                if ok_page(resp, "예약 완료"):
+                    successes.append(r)
+
+    threads = [threading.Thread(target=contender, args=(c,)) for c in range(args.contenders)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    stats = summarize(latencies, wall)
+    stats.update(contenders=args.contenders, rounds=args.rounds, accepted=len(successes))
+    return stats
+
+
+def git_rev():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parse_args()
+    report = json.dumps(run_suite(args), ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
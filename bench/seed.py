@@ -0,0 +1,80 @@
+"""✅ 한 학기 분량의 예약 데이터 생성
+
+    python -m bench.seed --weeks 16 --students 2000
+
+오늘 기준 (weeks - 4)주 전부터 4주 뒤까지, 방/좌석마다 하루 여러 건의 겹치지 않는 예약을 만든다.
+"""
+import argparse
+import random
+from datetime import timedelta
+
+SEED_ROOMS = ["1", "2"]
+SEED_SEATS = [str(i) for i in range(1, 8)]
+
+
+def student(i):
+    return f"B{i:06d}", f"학생{i}", f"010-{i // 10000:04d}-{i % 10000:04d}"
+
+
+def day_bookings(rng, busy):
+    """하루치 (시작, 길이) 목록 — busy(0~1) 비율만큼 채우고 서로 겹치지 않음"""
+    hour, result = rng.randint(0, 3), []
+    while hour < 24:
+        duration = min(rng.choice((1, 2, 2, 3, 4)), 24 - hour)  # 자정 넘김은 다음날과 겹칠 수 있어 제외
+        if rng.random() < busy:
+            result.append((hour, duration))
+            hour += duration
+        else:
+            hour += rng.randint(1, 3)
+    return result
+
+
+def seed_semester(weeks=16, students=2000, busy=0.35, seed=42, today=None):
+    """예약 + 점유(slot_claims) + 학생별 목록(student_bookings) 생성 → {"group": 건수, "personal": 건수}"""
+    from db import db
+    from db.booking import rebuild_claims, rebuild_student_bookings
+    from db.models import Reservation, PersonalReservation
+
+    rng = random.Random(seed)
+    start = today - timedelta(weeks=weeks - 4)
+    counts = {"group": 0, "personal": 0}
+
+    for day_offset in range(weeks * 7):
+        date = start + timedelta(days=day_offset)
+        rows = []
+        for room in SEED_ROOMS:
+            for hour, duration in day_bookings(rng, busy):
+                sid, name, phone = student(rng.randrange(students))
+                rows.append(Reservation(room=room, date=date, hour=hour, duration=duration, total_people=1,
+                                        leader_id=sid, leader_name=name, leader_phone=phone))
+                counts["group"] += 1
+        for seat in SEED_SEATS:
+            for hour, duration in day_bookings(rng, busy):
+                sid, name, phone = student(rng.randrange(students))
+                rows.append(PersonalReservation(seat=seat, date=date, hour=hour, duration=duration, total_people=1,
+                                                leader_id=sid, leader_name=name, leader_phone=phone))
+                counts["personal"] += 1
+        db.session.add_all(rows)
+        db.session.commit()
+
+    rebuild_claims()
+    rebuild_student_bookings()
+    return counts
+
+
+def main():
+    p = argparse.ArgumentParser(description="한 학기 예약 데이터 생성")
+    p.add_argument("--weeks", type=int, default=16)
+    p.add_argument("--students", type=int, default=2000)
+    p.add_argument("--busy", type=float, default=0.35)
+    args = p.parse_args()
+
+    from bench.common import bootstrap_app
+    app_module = bootstrap_app()
+    with app_module.app.app_context():
+        counts = seed_semester(args.weeks, args.students, args.busy, today=app_module.make_days(1)[0])
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""✅ "오늘 이후 내 예약 전체" 조회 벤치마크 (10만 건 이상)
+
+    python -m bench.student_lookup --weeks 520 --students 5000 --lookups 2000
+
+- legacy: reservations / personal_reservations 를 이름·학번·전화·날짜로 각각 조회 (2 쿼리)
+- student_bookings: (student_id, start_at) 인덱스 범위 조회 1번
+DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import random
+from datetime import datetime
+
+from bench.common import bootstrap_app, summarize, timed
+from bench.seed import seed_semester, student
+
+
+def legacy_lookup(sid, name, phone, today):
+    from db.models import Reservation, PersonalReservation
+    group = Reservation.query.filter(
+        Reservation.leader_name == name,
+        Reservation.leader_id == sid,
+        Reservation.leader_phone == phone,
+        Reservation.date >= today
+    ).order_by(Reservation.start_at).all()
+    personal = PersonalReservation.query.filter(
+        PersonalReservation.leader_name == name,
+        PersonalReservation.leader_id == sid,
+        PersonalReservation.leader_phone == phone,
+        PersonalReservation.date >= today
+    ).order_by(PersonalReservation.start_at).all()
+    return len(group) + len(personal)
+
+
+def indexed_lookup(sid, name, phone, today):
+    from db.booking import student_bookings
+    return len(student_bookings(sid, datetime.combine(today, datetime.min.time()), name, phone))
+
+
+def query_plan(stmt):
+    from db import db
+    if db.engine.dialect.name == "sqlite":
+        return [row[-1] for row in db.session.execute(db.text("EXPLAIN QUERY PLAN " + stmt))]
+    return [row[0] for row in db.session.execute(db.text("EXPLAIN " + stmt))]
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--weeks", type=int, default=520)
+    p.add_argument("--students", type=int, default=5000)
+    p.add_argument("--lookups", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out")
+    args = p.parse_args()
+
+    app_module = bootstrap_app()
+    today = app_module.make_days(1)[0]
+    rng = random.Random(args.seed)
+    results = {}
+
+    with app_module.app.app_context():
+        seeded, seed_s = timed(seed_semester, args.weeks, args.students, seed=args.seed, today=today)
+        targets = [student(rng.randrange(args.students)) for _ in range(args.lookups)]
+
+        for name, fn in (("legacy_two_queries", legacy_lookup), ("student_bookings", indexed_lookup)):
+            latencies, found = [], 0
+            for sid, sname, phone in targets:
+                count, seconds = timed(fn, sid, sname, phone, today)
+                latencies.append(seconds)
+                found += count
+            results[name] = dict(summarize(latencies), rows_found=found)
+
+        sid, sname, phone = targets[0]
+        results["plan"] = {
+            "legacy": query_plan(
+                f"SELECT * FROM reservations WHERE leader_name='{sname}' AND leader_id='{sid}' "
+                f"AND leader_phone='{phone}' AND date >= '{today}' ORDER BY start_at"),
+            "student_bookings": query_plan(
+                f"SELECT * FROM student_bookings WHERE student_id='{sid}' AND start_at >= '{today}' "
+                f"AND leader_name='{sname}' AND leader_phone='{phone}' ORDER BY start_at"),
+        }
+
+    report = {"seeded_rows": seeded, "seed_s": round(seed_s, 2), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
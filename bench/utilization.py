@@ -0,0 +1,89 @@
+"""✅ 이용률 리포트 벤치마크 — 원본 예약 스캔 vs 집계 테이블
+
+    python -m bench.utilization --weeks 52 --reports 50
+
+- raw_scan: 두 예약 테이블(live + archive)을 기간으로 읽어 시간칸을 Python에서 펼쳐 합산 (O(예약 수))
+- rollup: utilization_report() — utilization_hours GROUP BY 2번 (O(자원 × 날짜))
+두 방식의 시간대별 합계가 같은지도 확인한다. DATABASE_URL 미설정 시 임시 SQLite 파일을 사용한다.
+"""
+import argparse
+import json
+import random
+from datetime import timedelta
+
+from bench.common import bootstrap_app, summarize, timed
+from bench.seed import seed_semester
+
+
+def raw_scan(first, last):
+    """{(종류, 자원): [시간대별 예약 시간] * 24}"""
+    from db import db
+    from db.archive import history
+    from db.booking import slot_times
+    from db.conflicts import MODELS
+    hours = {}
+    for kind in MODELS:
+        # 전날 시작해 자정을 넘긴 예약까지 읽고 기간 밖 칸은 버림
+        for row in db.session.execute(history(kind, first - timedelta(days=1), last)):
+            for slot_at in slot_times(row.date, row.hour, row.duration or 1):
+                if first <= slot_at.date() <= last:
+                    hours.setdefault((kind, str(row.resource)), [0] * 24)[slot_at.hour] += 1
+    return hours
+
+
+def rollup(first, last):
+    from db.utilization import utilization_report
+    return {(r["kind"], r["code"]): [n for _, n, _ in r["by_hour"]]
+            for r in utilization_report(first, last) if r["booked_hours"]}
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--weeks", type=int, default=52)
+    p.add_argument("--students", type=int, default=2000)
+    p.add_argument("--reports", type=int, default=50)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--out")
+    args = p.parse_args()
+    if args.weeks < 1:
+        p.error("--weeks 는 1 이상이어야 합니다")
+
+    app_module = bootstrap_app()
+    today = app_module.make_days(1)[0]
+    rng = random.Random(args.seed)
+    results = {}
+
+    with app_module.app.app_context():
+        from db.utilization import rebuild_utilization
+        seeded, seed_s = timed(seed_semester, args.weeks, args.students, seed=args.seed, today=today)
+        cells, rebuild_s = timed(rebuild_utilization)
+
+        earliest = today - timedelta(weeks=args.weeks - 4)
+        seeded_days = args.weeks * 7
+        ranges = []
+        for _ in range(args.reports):
+            span = min(rng.choice((7, 28, 112)), seeded_days)  # 시드한 기간보다 길지 않게
+            first = earliest + timedelta(days=rng.randrange(seeded_days - span + 1))
+            ranges.append((first, first + timedelta(days=span - 1)))
+
+        answers = {}
+        for name, fn in (("raw_scan", raw_scan), ("rollup", rollup)):
+            latencies, answers[name] = [], []
+            for first, last in ranges:
+                result, seconds = timed(fn, first, last)
+                latencies.append(seconds)
+                answers[name].append(result)
+            results[name] = summarize(latencies)
+        results["same_results"] = answers["raw_scan"] == answers["rollup"]
+
+    report = {"seeded_rows": seeded, "seed_s": round(seed_s, 2), "rollup_cells": cells,
+              "rebuild_s": round(rebuild_s, 2), "results": results}
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
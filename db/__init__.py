@@ -1,12 +1,12 @@
 import os
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
 # ✅ SQLAlchemy 인스턴스 생성
 db = SQLAlchemy()
 
 def create_app():
-    """Flask 앱 생성 및 DB 초기화"""
+    """Flask 앱 생성 (import 시 DB 쿼리 없음 — 스키마는 init-db 명령으로)"""
     BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
     app = Flask(
@@ -28,20 +28,47 @@ def create_app():
 
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # ✅ 풀 크기 / pre-ping / recycle / statement_timeout (환경변수, db/engine.py)
+    from db.engine import engine_options, init_engine
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(database_url)
     app.secret_key = os.getenv("SECRET_KEY", "studyroom-secret-key")
 
+    # ✅ 템플릿 바이트코드 캐시 + 공백 제거 (jinja_env 생성 전에 설정)
+    from services import templating
+    templating.init_app(app)
+
+    # ✅ 구조화 로그 (JSON lines, 백그라운드 스레드가 stdout에 씀)
+    from services.logs import init_logging
+    init_logging()
+
     db.init_app(app)
+    init_engine(app)
+
+    from db.cli import register_commands
+    register_commands(app)
+
+    # ✅ 요청 계측 (SQL/템플릿/전체 시간 → /metrics)
+    from services import metrics
+    metrics.init_app(app)
+
+    # ✅ 응답 압축 (COMPRESS_RESPONSES=1) — 계측보다 뒤에 등록해야 압축 후 크기가 기록됨
+    from services import compress
+    compress.init_app(app)
+
+    # ✅ 예약표 읽기 캐시 (GRID_CACHE_BACKEND)
+    from services import cache
+    cache.init_app(app)
+
+    # ✅ 실시간 예약 변경 버스 (SSE / 롱폴링)
+    from services import events
+    events.init_app(app)
+
+    # ✅ 모델 등록만 (DB 접속 없음)
+    # 테이블 생성/타입 전환/시퀀스 보정은 flask --app app init-db (gunicorn은 마스터에서 1회)
+    from db import models  # noqa: F401
 
-    # ✅ import db.models → models.db 로 접근
-    with app.app_context():
-        from db import models
-        models.db.create_all()
-        print("✅ DB 테이블 생성 완료 —", database_url)
-
-    # ✅ 정적 파일 직접 제공 (Railway PNG/CSS 깨짐 방지)
-    @app.route('/static/<path:filename>')
-    def static_files(filename):
-        static_dir = os.path.join(BASE_DIR, 'static')
-        return send_from_directory(static_dir, filename)
+    # ✅ 정적 파일: 해시 URL + immutable 캐시 + ETag/304 + 사전 압축본 (기본 static 라우트 대체)
+    from services import assets
+    assets.init_app(app)
 
     return app
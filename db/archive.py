@@ -0,0 +1,106 @@
+"""✅ 지난 예약 보관 (hot/cold 분리)
+
+예약 경로(예약표·예약·연장·취소)는 오늘 이후만 읽으므로, 보관 기간이 지난 예약은
+*_archive 테이블로 옮겨 live 테이블과 인덱스를 작게 유지한다.
+- 배치마다 INSERT ... SELECT → DELETE 를 한 트랜잭션으로 (중간에 멈춰도 행이 사라지거나 중복되지 않음)
+- 옮긴 예약의 slot_claims / student_bookings 행은 삭제, 팀원은 reservation_members_archive 로 이동
+- 리포트는 history() 로 live + archive 를 함께 읽는다
+
+    flask --app app archive-reservations --days 30
+"""
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select, text, union_all
+
+from db import db
+from db.conflicts import MODELS, RESOURCE_COLUMN
+from db.models import (
+    ReservationMember, SlotClaim, StudentBooking,
+    reservations_archive, personal_reservations_archive, reservation_members_archive,
+)
+from services.logs import get_logger
+
+log = get_logger("archive")
+
+ARCHIVES = {"group": reservations_archive, "personal": personal_reservations_archive}
+DEFAULT_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "30"))
+BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "5000"))
+
+
+def archive_cutoff(today, retention_days=DEFAULT_RETENTION_DAYS):
+    """today 자정에서 retention_days일 전 (최소 1일 — 전날 밤 자정 넘김 예약은 예약표가 읽음)"""
+    return datetime.combine(today, datetime.min.time()) - timedelta(days=max(retention_days, 1))
+
+
+def _move(source, target, where, archived_at):
+    """source 의 where 행을 target 으로 복사 후 삭제 → 옮긴 수"""
+    names = [c.name for c in source.columns]
+    db.session.execute(insert(target).from_select(
+        names + ["archived_at"],
+        select(*source.columns, literal(archived_at, db.DateTime)).where(where),
+    ))
+    return db.session.execute(delete(source).where(where)).rowcount
+
+
+def archive_before(cutoff, batch_size=BATCH_SIZE):
+    """end_at < cutoff 인 예약을 보관 테이블로 이동 → {"group": 수, "personal": 수, "members": 수}"""
+    moved = {"group": 0, "personal": 0, "members": 0}
+    for kind, Model in MODELS.items():
+        live = Model.__table__
+        while True:
+            # 이번 배치: 오래된 순 batch_size 건 (id 상한으로 범위 지정 → 바인드 값 1개)
+            oldest = (select(live.c.id).where(live.c.end_at < cutoff)
+                      .order_by(live.c.id).limit(batch_size).subquery())
+            max_id = db.session.execute(select(func.max(oldest.c.id))).scalar()
+            if max_id is None:
+                break
+            batch = (live.c.end_at < cutoff) & (live.c.id <= max_id)
+            ids = select(live.c.id).where(batch)
+            archived_at = datetime.utcnow()
+
+            if kind == "group":
+                moved["members"] += _move(
+                    ReservationMember.__table__, reservation_members_archive,
+                    ReservationMember.reservation_id.in_(ids), archived_at)
+            for Table in (SlotClaim, StudentBooking):
+                db.session.execute(delete(Table).where(Table.kind == kind, Table.reservation_id.in_(ids)))
+            moved[kind] += _move(live, ARCHIVES[kind], batch, archived_at)
+            db.session.commit()
+            log.info("archived batch", extra={"kind": kind, "max_id": max_id, "total": moved[kind]})
+
+    if moved["group"] or moved["personal"]:
+        _analyze([Model.__tablename__ for Model in MODELS.values()])
+    return moved
+
+
+def _analyze(tables):
+    """플래너 통계 갱신 (행이 크게 줄었으므로)"""
+    with db.engine.begin() as conn:
+        for name in tables:
+            conn.execute(text(f"ANALYZE {name}"))
+
+
+def history(kind, first=None, last=None):
+    """first~last 날짜(생략 시 전체)의 예약 (live + archive) — 리포트용 select
+
+    컬럼: resource, date, hour, duration, leader_id, start_at, end_at
+    """
+    def rows(table):
+        stmt = select(
+            table.c[RESOURCE_COLUMN[kind]].label("resource"), table.c.date, table.c.hour,
+            table.c.duration, table.c.leader_id, table.c.start_at, table.c.end_at,
+        )
+        if first is not None:
+            stmt = stmt.where(table.c.date >= first)
+        if last is not None:
+            stmt = stmt.where(table.c.date <= last)
+        return stmt
+
+    return union_all(rows(MODELS[kind].__table__), rows(ARCHIVES[kind]))
+
+
+def table_counts():
+    """{테이블: 행 수} — live / archive 크기 확인용"""
+    tables = [Model.__table__ for Model in MODELS.values()] + list(ARCHIVES.values())
+    return {t.name: db.session.execute(select(func.count()).select_from(t)).scalar() for t in tables}
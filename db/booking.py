@@ -0,0 +1,360 @@
+"""✅ 원자적 예약 처리
+
+예약 1건 = 예약 행 + 시간 단위 점유(SlotClaim) 행들을 한 트랜잭션으로 저장한다.
+겹침은 먼저 db.conflicts 구간 비교로 검사하고, 그 사이 끼어든 동시 요청은
+유일 인덱스(ux_claim_slot)가 막으므로 여러 gunicorn 워커가 같은 시간을 예약해도 한쪽은 실패한다.
+"""
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from db import db
+from db.models import Reservation, ReservationMember, SlotClaim, StudentBooking, booking_span
+from db.versions import bump_version
+from db.events import publish
+from db.occupancy import owner_label
+from db.utilization import record_usage
+from db.conflicts import MODELS, RESOURCE_COLUMN, booking_conflict, extension_conflict, series_conflicts
+from services.logs import get_logger
+
+log = get_logger("booking")
+
+MAX_SERIES_WEEKS = 20  # 반복 예약은 한 학기(+여유) 안에서만
+MAX_DURATION = 3  # 예약 폼의 이용시간 선택지 (1~3시간)
+MAX_EXTEND_HOURS = 2  # 연장 버튼 (1시간 / 2시간)
+
+
+class BookingConflict(Exception):
+    """예약하려는 시간이 기존 예약과 겹칠 때 발생
+
+    reason: "resource" (같은 방/좌석) 또는 "student" (같은 학번의 다른 종류 예약)
+    existing: 겹친 기존 예약 (찾지 못하면 None)
+    """
+
+    def __init__(self, reason, existing=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.existing = existing
+
+
+class InvalidBooking(ValueError):
+    """시작 시각·이용시간이 허용 범위를 벗어날 때 발생 (메시지는 사용자 안내 문구)"""
+
+
+def check_span(hour, duration):
+    """0 <= hour <= 23, 1 <= duration <= MAX_DURATION 이 아니면 InvalidBooking
+
+    duration이 0 이하면 점유(SlotClaim) 행이 하나도 생기지 않아 유일 인덱스가 겹침을 막지 못한다.
+    """
+    if not isinstance(hour, int) or not 0 <= hour <= 23:
+        raise InvalidBooking("시작 시각이 올바르지 않습니다.")
+    if not isinstance(duration, int) or not 1 <= duration <= MAX_DURATION:
+        raise InvalidBooking(f"이용시간은 1~{MAX_DURATION}시간만 가능합니다.")
+
+
+def resource_of(kind, reservation):
+    return reservation.room if kind == "group" else reservation.seat
+
+
+def slot_times(date, hour, duration):
+    """date의 hour시부터 duration시간 → 1시간 단위 시작 시각 목록 (자정 넘김 포함)"""
+    start, _ = booking_span(date, hour, duration)
+    return [start + timedelta(hours=i) for i in range(int(duration))]
+
+
+def _claims(kind, reservation, slots):
+    return [
+        SlotClaim(
+            kind=kind,
+            resource=str(resource_of(kind, reservation)),
+            slot_at=slot_at,
+            student_id=reservation.leader_id,
+            reservation_id=reservation.id,
+        )
+        for slot_at in slots
+    ]
+
+
+def _student_booking(kind, reservation):
+    return StudentBooking(
+        student_id=reservation.leader_id,
+        start_at=reservation.start_at,
+        end_at=reservation.end_at,
+        kind=kind,
+        reservation_id=reservation.id,
+        resource=str(resource_of(kind, reservation)),
+        date=reservation.date,
+        hour=reservation.hour,
+        duration=int(reservation.duration or 1),
+        leader_name=reservation.leader_name,
+        leader_phone=reservation.leader_phone,
+    )
+
+
+def _members(reservation_id, date, members):
+    """[(학번, 이름)...] → reservation_members 행 dict 목록"""
+    return [dict(reservation_id=reservation_id, student_id=sid, name=name, date=date) for sid, name in members]
+
+
+def _touch(kind, reservation, op, slots):
+    """자원 버전 +1 · 변경 이벤트 기록 · 이용률 집계 증감 (같은 트랜잭션)"""
+    resource = resource_of(kind, reservation)
+    bump_version(kind, resource)
+    record_usage(kind, resource, slots, 1 if op == "booked" else -1)
+    label = owner_label(reservation.leader_id, reservation.leader_name) if op == "booked" else None
+    publish(kind, resource, op, slots, label)
+
+
+def book(kind, members=(), **fields):
+    """예약 생성 + 시간 점유를 한 트랜잭션으로 커밋. 겹치면 BookingConflict
+
+    members: 단체 예약의 팀원 [(학번, 이름)...] — 팀원의 개인석 예약과도 겹침 검사
+    시각·이용시간이 범위 밖이면 InvalidBooking
+    """
+    check_span(fields.get("hour"), fields.get("duration"))
+    reservation = MODELS[kind](**fields)
+    resource = resource_of(kind, reservation)
+    slots = slot_times(reservation.date, reservation.hour, reservation.duration)
+    member_ids = [sid for sid, _ in members]
+
+    def conflict():
+        return booking_conflict(kind, resource, reservation.leader_id,
+                                reservation.date, reservation.hour, reservation.duration, member_ids)
+
+    found = conflict()
+    if found is not None:
+        raise BookingConflict(*found)
+
+    try:
+        db.session.add(reservation)
+        db.session.flush()  # id · start_at/end_at 할당
+        db.session.add_all(_claims(kind, reservation, slots))
+        db.session.add(_student_booking(kind, reservation))
+        if members:
+            db.session.execute(insert(ReservationMember), _members(reservation.id, reservation.date, members))
+        _touch(kind, reservation, "booked", slots)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        found = conflict()  # 검사 뒤 커밋 전에 끼어든 예약
+        if found is None:
+            raise  # 겹침이 아닌 제약 위반 (필수 값 누락 등)
+        raise BookingConflict(*found)
+
+    return reservation
+
+
+def repeat_dates(first, until, every_weeks):
+    """first부터 until(포함)까지 every_weeks주 간격 날짜 목록 (첫 주 포함 MAX_SERIES_WEEKS주 — 매주면 최대 20회)"""
+    last = min(until, first + timedelta(weeks=MAX_SERIES_WEEKS - 1))
+    dates, day = [], first
+    while day <= last:
+        dates.append(day)
+        day += timedelta(weeks=every_weeks)
+    return dates
+
+
+def book_series(kind, dates, hour, duration, members=(), **fields):
+    """반복 예약 — 모든 회차를 쿼리 1번으로 검사하고 겹치지 않는 회차만 한 트랜잭션으로 일괄 저장
+
+    → (저장된 날짜 목록, {날짜: (사유, 기존 예약)}) — 겹친 회차는 건너뛰고 나머지는 저장한다.
+    검사 뒤 끼어든 예약 때문에 유일 인덱스 위반이 나면 다시 검사해서 한 번 더 시도한다.
+    """
+    check_span(hour, duration)
+    resource = str(fields[RESOURCE_COLUMN[kind]])
+    spans = [booking_span(d, hour, duration) for d in dates]
+
+    for attempt in range(2):
+        conflicts = series_conflicts(kind, resource, fields["leader_id"], spans, [sid for sid, _ in members])
+        accepted = [i for i in range(len(dates)) if i not in conflicts]
+        if not accepted:
+            break
+        try:
+            _insert_series(kind, resource, [(dates[i], *spans[i]) for i in accepted], hour, duration, members, fields)
+            break
+        except IntegrityError:
+            db.session.rollback()
+            if attempt:
+                raise BookingConflict("resource")
+
+    return [dates[i] for i in accepted], {dates[i]: found for i, found in conflicts.items()}
+
+
+def _insert_series(kind, resource, occurrences, hour, duration, members, fields):
+    """[(날짜, start_at, end_at)...] 예약 + 점유 + 학생별 목록 + 팀원을 테이블마다 INSERT 1번으로 저장 후 커밋"""
+    Model = MODELS[kind]
+    rows = [dict(fields, date=d, hour=hour, duration=duration, start_at=start, end_at=end)
+            for d, start, end in occurrences]
+    ids = db.session.execute(
+        insert(Model).returning(Model.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+
+    claims, bookings, member_rows, slots = [], [], [], []
+    for reservation_id, row in zip(ids, rows):
+        member_rows += _members(reservation_id, row["date"], members)
+        occurrence_slots = slot_times(row["date"], hour, duration)
+        slots += occurrence_slots
+        claims += [
+            dict(kind=kind, resource=resource, slot_at=slot_at,
+                 student_id=row["leader_id"], reservation_id=reservation_id)
+            for slot_at in occurrence_slots
+        ]
+        bookings.append(dict(
+            student_id=row["leader_id"], start_at=row["start_at"], end_at=row["end_at"], kind=kind,
+            reservation_id=reservation_id, resource=resource, date=row["date"], hour=hour,
+            duration=duration, leader_name=row["leader_name"], leader_phone=row["leader_phone"],
+        ))
+    db.session.execute(insert(SlotClaim), claims)
+    db.session.execute(insert(StudentBooking), bookings)
+    if member_rows:
+        db.session.execute(insert(ReservationMember), member_rows)
+
+    bump_version(kind, resource)
+    record_usage(kind, resource, slots, 1)
+    publish(kind, resource, "booked", slots, owner_label(fields["leader_id"], fields["leader_name"]))
+    db.session.commit()
+
+
+def extend(kind, reservation, extra_hours):
+    """기존 예약 뒤로 extra_hours시간 연장 (뒤 시간대가 겹치면 BookingConflict, 1~MAX_EXTEND_HOURS 밖이면 InvalidBooking)"""
+    if not isinstance(extra_hours, int) or not 1 <= extra_hours <= MAX_EXTEND_HOURS:
+        raise InvalidBooking(f"연장은 1~{MAX_EXTEND_HOURS}시간만 가능합니다.")
+    found = extension_conflict(kind, reservation, extra_hours)
+    if found is not None:
+        raise BookingConflict(*found)
+
+    end_slots = slot_times(reservation.date, reservation.hour, int(reservation.duration) + extra_hours)
+    new_slots = end_slots[int(reservation.duration):]
+
+    try:
+        reservation.duration = int(reservation.duration) + extra_hours
+        db.session.add_all(_claims(kind, reservation, new_slots))
+        db.session.flush()  # end_at 재계산
+        StudentBooking.query.filter_by(kind=kind, reservation_id=reservation.id).update(
+            {"duration": reservation.duration, "end_at": reservation.end_at}, synchronize_session=False)
+        _touch(kind, reservation, "booked", new_slots)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise BookingConflict("resource")
+
+    return reservation
+
+
+def cancel_many(student_id, leader_name, selected):
+    """{종류: [예약 id]} 일괄 취소 — 종류별 DELETE ... RETURNING 1번 (커밋은 호출자가)
+
+    학번·이름이 맞는 예약만 지워지며, 실제로 지워진 id를 {종류: set(id)}로 반환한다.
+    점유·학생별 목록 정리와 자원 버전/이벤트는 지워진 행 기준으로 한꺼번에 처리.
+    """
+    removed = {}
+    for kind, ids in selected.items():
+        removed[kind] = set()
+        if not ids:
+            continue
+        Model = MODELS[kind]
+        rows = db.session.execute(
+            delete(Model)
+            .where(Model.id.in_(ids), Model.leader_id == student_id, Model.leader_name == leader_name)
+            .returning(Model.id, getattr(Model, "room" if kind == "group" else "seat").label("resource"),
+                       Model.date, Model.hour, Model.duration),
+            execution_options={"synchronize_session": False},
+        ).all()
+        if not rows:
+            continue
+
+        removed[kind] = {row.id for row in rows}
+        for Table in (SlotClaim, StudentBooking):
+            db.session.execute(
+                delete(Table).where(Table.kind == kind, Table.reservation_id.in_(removed[kind])),
+                execution_options={"synchronize_session": False},
+            )
+        if kind == "group":
+            db.session.execute(
+                delete(ReservationMember).where(ReservationMember.reservation_id.in_(removed[kind])),
+                execution_options={"synchronize_session": False},
+            )
+
+        released = {}
+        for row in rows:
+            released.setdefault(str(row.resource), []).extend(slot_times(row.date, row.hour, row.duration or 1))
+        for resource, slots in released.items():
+            bump_version(kind, resource)
+            record_usage(kind, resource, slots, -1)
+            publish(kind, resource, "released", sorted(slots))
+    return removed
+
+
+def rebuild_claims():
+    """기존 예약 전체로부터 점유 테이블 재구성 → (점유 수, 겹쳐서 건너뛴 예약 수)"""
+    SlotClaim.query.delete(synchronize_session=False)
+    db.session.commit()
+
+    claimed, skipped = 0, 0
+    for kind, Model in MODELS.items():
+        for r in Model.query.order_by(Model.id).all():
+            try:
+                slots = slot_times(r.date, r.hour, r.duration or 1)
+                with db.session.begin_nested():
+                    db.session.add_all(_claims(kind, r, slots))
+                claimed += len(slots)
+            except (IntegrityError, ValueError) as e:
+                skipped += 1
+                log.warning("slot claim skipped", extra={"kind": kind, "reservation_id": r.id, "error": str(e)})
+    db.session.commit()
+    return claimed, skipped
+
+
+def rebuild_student_bookings():
+    """기존 예약 전체로부터 학생별 예약 목록 재구성 → 행 수"""
+    StudentBooking.query.delete(synchronize_session=False)
+    count = 0
+    for kind, Model in MODELS.items():
+        for r in Model.query.order_by(Model.id).all():
+            db.session.add(_student_booking(kind, r))
+            count += 1
+    db.session.commit()
+    return count
+
+
+def backfill_members():
+    """예전 member_N_name/member_N_id 칸 → reservation_members (팀원 행이 아직 없는 예약만) → 추가한 행 수"""
+    has_members = select(ReservationMember.id).where(ReservationMember.reservation_id == Reservation.id).exists()
+    rows = []
+    for r in Reservation.query.filter(~has_members).order_by(Reservation.id).all():
+        rows += _members(r.id, r.date, legacy_members(r))
+    if rows:
+        db.session.execute(insert(ReservationMember), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def legacy_members(reservation):
+    """예약 행의 member_1~5 칸 → [(학번, 이름)...] (대표자·빈 칸·중복 제외)"""
+    members, seen = [], {reservation.leader_id}
+    for i in range(1, 6):
+        sid = (getattr(reservation, f"member_{i}_id") or "").strip().upper()
+        if sid and sid not in seen:
+            seen.add(sid)
+            members.append((sid, (getattr(reservation, f"member_{i}_name") or "").strip()))
+    return members
+
+
+def student_bookings(student_id, since, leader_name=None, leader_phone=None):
+    """since 이후 시작하는 학생의 예약 (단체+개인, 시작 시각 순) — 인덱스 범위 조회 1번
+
+    ORM 객체가 아닌 행(Row)을 돌려주므로 커밋/삭제 후에도 다시 읽지 않고 그대로 표시할 수 있다.
+    """
+    stmt = select(
+        StudentBooking.kind, StudentBooking.reservation_id, StudentBooking.resource,
+        StudentBooking.date, StudentBooking.hour, StudentBooking.duration, StudentBooking.start_at,
+    ).where(
+        StudentBooking.student_id == student_id,
+        StudentBooking.start_at >= since,
+    )
+    if leader_name is not None:
+        stmt = stmt.where(StudentBooking.leader_name == leader_name)
+    if leader_phone is not None:
+        stmt = stmt.where(StudentBooking.leader_phone == leader_phone)
+    return db.session.execute(stmt.order_by(StudentBooking.start_at)).all()
@@ -0,0 +1,104 @@
+"""✅ 관리용 flask CLI 명령 (flask --app app <명령>)"""
+import click
+
+
+def register_commands(app):
+    @app.cli.command("init-db")
+    def init_db_command():
+        """테이블 생성 + 타입 전환 + 시퀀스 보정 (배포 시 1회, 이미 최신이면 변경 없음)"""
+        from db.schema import init_schema
+        result = init_schema()
+        click.echo(f"✅ 새 테이블: {', '.join(result['created']) or '없음'}")
+        click.echo(f"✅ 타입 전환: {', '.join(result['upgraded']) or '이미 최신 스키마'}")
+        click.echo(f"✅ 시퀀스 보정: {', '.join(result['sequences']) or '대상 없음 (Postgres 아님)'}")
+
+    @app.cli.command("sync-slot-claims")
+    def sync_slot_claims():
+        """기존 예약으로부터 시간 점유(slot_claims) 테이블 재구성"""
+        from db.booking import rebuild_claims
+        claimed, skipped = rebuild_claims()
+        click.echo(f"✅ 점유 {claimed}건 생성, 겹친 예약 {skipped}건 건너뜀")
+
+    @app.cli.command("sync-student-bookings")
+    def sync_student_bookings():
+        """기존 예약으로부터 학생별 예약 목록(student_bookings) 재구성"""
+        from db.booking import rebuild_student_bookings
+        click.echo(f"✅ 학생별 예약 {rebuild_student_bookings()}건 생성")
+
+    @app.cli.command("sync-reservation-members")
+    def sync_reservation_members():
+        """예전 member_N 칸의 팀원을 팀원 테이블(reservation_members)로 옮김 (이미 옮긴 예약은 건너뜀)"""
+        from db.booking import backfill_members
+        click.echo(f"✅ 팀원 {backfill_members()}명 등록")
+
+    @app.cli.command("sync-utilization")
+    def sync_utilization():
+        """예약 원본(live + archive)으로부터 이용률 집계(utilization_hours) 재구성"""
+        from db.utilization import rebuild_utilization
+        click.echo(f"✅ 이용률 집계 {rebuild_utilization()}칸 생성")
+
+    @app.cli.command("add-resource")
+    @click.option("--kind", type=click.Choice(["group", "personal"]), required=True, help="프로젝트실 / 개인석")
+    @click.option("--code", required=True, help="예약에 저장되는 방/좌석 번호")
+    @click.option("--name", help="화면 표시 이름")
+    @click.option("--building", help="건물")
+    @click.option("--floor", type=int, help="층")
+    @click.option("--capacity", type=int, help="수용 인원")
+    @click.option("--sort-order", type=int, help="탭 정렬 순서")
+    @click.option("--active/--inactive", default=None, help="사용 여부 (생략 시 유지)")
+    def add_resource(kind, code, name, building, floor, capacity, sort_order, active):
+        """자원 목록(resources)에 방/좌석 추가 또는 변경"""
+        from db import db
+        from db.resources import DEFAULT_BUILDING, upsert_resource
+        resource = upsert_resource(kind, code, name=name, building=building, floor=floor,
+                                   capacity=capacity, sort_order=sort_order, active=active)
+        resource.building = resource.building or DEFAULT_BUILDING
+        db.session.commit()
+        click.echo(f"✅ {resource.kind}:{resource.code} {resource.name} "
+                   f"({resource.building}, {resource.capacity}명, {'사용' if resource.active else '중지'})")
+
+    @app.cli.command("repair-sequences")
+    def repair_sequences_command():
+        """Postgres id 시퀀스를 MAX(id)에 맞춤"""
+        from db.schema import repair_sequences
+        repaired = repair_sequences()
+        click.echo(f"✅ 시퀀스 보정: {', '.join(repaired) or '대상 없음 (Postgres 아님)'}")
+
+    @app.cli.command("upgrade-schema")
+    def upgrade_schema_command():
+        """date/hour 문자열 컬럼 → Date/SmallInteger + start_at/end_at 채우기"""
+        from db.schema import upgrade_typed_columns
+        upgraded = upgrade_typed_columns()
+        click.echo(f"✅ 타입 전환: {', '.join(upgraded) or '이미 최신 스키마'}")
+
+    @app.cli.command("prune-slot-events")
+    @click.option("--hours", default=24, show_default=True, help="보관 시간")
+    def prune_slot_events(hours):
+        """실시간 갱신용 slot_events 중 오래된 행 삭제"""
+        from db.events import prune_events
+        click.echo(f"✅ 이벤트 {prune_events(hours)}건 삭제")
+
+    @app.cli.command("archive-reservations")
+    @click.option("--days", type=int, default=None, help="보관 기간 (기본: ARCHIVE_RETENTION_DAYS 또는 30)")
+    def archive_reservations(days):
+        """보관 기간이 지난 예약을 *_archive 테이블로 이동 (live 테이블·인덱스 축소)"""
+        from datetime import datetime, timedelta, timezone
+        from db.archive import DEFAULT_RETENTION_DAYS, archive_before, archive_cutoff, table_counts
+        today = datetime.now(timezone(timedelta(hours=9))).date()
+        cutoff = archive_cutoff(today, DEFAULT_RETENTION_DAYS if days is None else days)
+        moved = archive_before(cutoff)
+        click.echo(f"✅ {cutoff} 이전 종료 예약 이동: 단체 {moved['group']}건, 개인 {moved['personal']}건, "
+                   f"팀원 {moved['members']}명")
+        click.echo("✅ " + ", ".join(f"{name} {count}행" for name, count in table_counts().items()))
+
+    @app.cli.command("build-static")
+    def build_static_command():
+        """static/ 의 js/css 등을 미리 압축 (.gz, brotli 설치 시 .br)"""
+        built = app.extensions["static_assets"].build()
+        click.echo(f"✅ 사전 압축: {', '.join(built) or '대상 없음'}")
+
+    @app.cli.command("compile-templates")
+    def compile_templates_command():
+        """모든 템플릿을 미리 컴파일해 바이트코드 캐시에 저장"""
+        from services.templating import precompile
+        click.echo(f"✅ 템플릿 {precompile(app)}개 컴파일")
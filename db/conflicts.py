@@ -0,0 +1,192 @@
+"""✅ 예약 겹침 검사 — 모든 예약을 KST 절대 구간 [start_at, end_at) 으로 비교
+
+자정을 넘기는 예약(23시 + 2시간 → 다음날 01시)도 날짜/시간 쪼개기 없이 그대로 비교된다.
+- 같은 방/좌석: 구간이 겹치면 "resource" 충돌
+- 같은 학번의 다른 종류(단체↔개인) 예약: 구간이 겹치면 "student" 충돌
+- 팀원(reservation_members)의 다른 종류 예약: 구간이 겹치면 "member" 충돌
+  (단체 예약 → 팀원들의 개인석, 개인석 예약 → 본인이 팀원으로 들어간 프로젝트실)
+
+예약/연장 시 미리 검사하고(반복 예약은 모든 회차를 쿼리 1번으로), 동시에 들어온 요청은 slot_claims 유일 인덱스가 최종 차단한다.
+"""
+from bisect import bisect_left
+from datetime import timedelta
+
+from sqlalchemy import and_, case, literal, or_, select, union_all
+
+from db import db
+from db.models import Reservation, PersonalReservation, ReservationMember, StudentBooking, booking_span
+
+MODELS = {"group": Reservation, "personal": PersonalReservation}
+RESOURCE_COLUMN = {"group": "room", "personal": "seat"}
+OTHER_KIND = {"group": "personal", "personal": "group"}
+MEMBER_LOOKBACK = timedelta(days=1)  # 전날 시작해 자정을 넘긴 단체 예약까지 (date 인덱스 범위)
+
+
+def overlaps(a_start, a_end, b_start, b_end):
+    """[a_start, a_end) 와 [b_start, b_end) 가 겹치는지 (끝과 시작이 맞닿으면 겹치지 않음)"""
+    return a_start < b_end and b_start < a_end
+
+
+class IntervalIndex:
+    """시작 시각 정렬 + 누적 최대 종료 시각 → 겹치는 구간을 O(log n + k)로 찾음"""
+
+    def __init__(self, intervals):
+        self._items = sorted(intervals, key=lambda iv: iv[0])  # (start, end, 값)
+        self._starts = [start for start, _, _ in self._items]
+        self._max_end = []
+        latest = None
+        for _, end, _ in self._items:
+            latest = end if latest is None or end > latest else latest
+            self._max_end.append(latest)
+
+    def __len__(self):
+        return len(self._items)
+
+    def overlapping(self, start, end):
+        """[start, end) 와 겹치는 값들 (시작 시각 순)"""
+        i = bisect_left(self._starts, end)  # [0, i) 만 start < end
+        found = []
+        while i > 0 and self._max_end[i - 1] > start:
+            i -= 1
+            item_start, item_end, value = self._items[i]
+            if overlaps(item_start, item_end, start, end):
+                found.append(value)
+        found.reverse()
+        return found
+
+    def first(self, start, end):
+        found = self.overlapping(start, end)
+        return found[0] if found else None
+
+
+def resource_intervals(kind, resource, start, end):
+    """방/좌석의 예약 중 [start, end) 와 만날 수 있는 것 → IntervalIndex (값: 예약 행)"""
+    Model = MODELS[kind]
+    rows = Model.query.filter(
+        getattr(Model, RESOURCE_COLUMN[kind]) == str(resource),
+        Model.end_at > start,
+        Model.start_at < end,
+    ).all()
+    return IntervalIndex((r.start_at, r.end_at, r) for r in rows)
+
+
+def student_intervals(student_ids, kinds, start, end):
+    """학번들의 kinds 종류 예약 중 [start, end) 와 만날 수 있는 것 → IntervalIndex (값: StudentBooking)"""
+    rows = StudentBooking.query.filter(
+        StudentBooking.student_id.in_(student_ids),
+        StudentBooking.kind.in_(kinds),
+        StudentBooking.start_at < end,
+        StudentBooking.end_at > start,
+    ).all()
+    return IntervalIndex((r.start_at, r.end_at, r) for r in rows)
+
+
+def _membership_rows(student_id, start, end, *leading):
+    """학번이 팀원으로 들어간 단체 예약 중 [start, end) 와 겹칠 수 있는 것
+    — reservation_members (student_id, date) 인덱스 → reservations PK 조인 1번"""
+    return select(
+        *leading, ReservationMember.student_id, Reservation.id, Reservation.date, Reservation.hour,
+        Reservation.duration, Reservation.start_at, Reservation.end_at,
+    ).join(Reservation, Reservation.id == ReservationMember.reservation_id).where(
+        ReservationMember.student_id == student_id,
+        ReservationMember.date.between((start - MEMBER_LOOKBACK).date(), end.date()),
+        Reservation.end_at > start,
+        Reservation.start_at < end,
+    )
+
+
+def member_intervals(student_id, start, end):
+    """학번이 팀원인 단체 예약 → IntervalIndex (값: student_id·id·date·hour·duration 행)"""
+    rows = db.session.execute(_membership_rows(student_id, start, end)).all()
+    return IntervalIndex((r.start_at, r.end_at, r) for r in rows)
+
+
+def reservation_member_ids(reservation_id):
+    """단체 예약의 팀원 학번 목록"""
+    return list(db.session.execute(
+        select(ReservationMember.student_id).where(ReservationMember.reservation_id == reservation_id)
+    ).scalars())
+
+
+def find_conflict(kind, resource, student_id, start, end, exclude_id=None, member_ids=()):
+    """[start, end) 예약이 불가능하면 (사유, 기존 예약), 가능하면 None
+
+    사유: "student" (같은 학번의 다른 종류 예약) / "member" (팀원이 걸린 다른 종류 예약)
+    → "resource" (같은 방/좌석) 순으로 검사. member 충돌의 기존 예약에는 student_id 가 있다.
+    exclude_id: 연장처럼 자기 자신은 빼고 볼 예약 id
+    member_ids: 단체 예약의 팀원 학번들 (팀원의 개인석 예약도 검사)
+    """
+    existing = student_intervals([student_id, *member_ids], [OTHER_KIND[kind]], start, end).first(start, end)
+    if existing is not None:
+        return ("student" if existing.student_id == student_id else "member"), existing
+
+    if kind == "personal":
+        existing = member_intervals(student_id, start, end).first(start, end)
+        if existing is not None:
+            return "member", existing
+
+    for r in resource_intervals(kind, resource, start, end).overlapping(start, end):
+        if r.id != exclude_id:
+            return "resource", r
+    return None
+
+
+def booking_conflict(kind, resource, student_id, date, hour, duration, member_ids=()):
+    """date·hour·duration 예약의 충돌 검사 (자정 넘김 포함)"""
+    start, end = booking_span(date, hour, duration)
+    return find_conflict(kind, resource, student_id, start, end, member_ids=member_ids)
+
+
+def extension_conflict(kind, reservation, extra_hours):
+    """reservation 뒤로 extra_hours 연장할 때 새로 필요한 구간의 충돌 검사"""
+    _, end = booking_span(reservation.date, reservation.hour, int(reservation.duration or 1) + extra_hours)
+    member_ids = reservation_member_ids(reservation.id) if kind == "group" else ()
+    return find_conflict(kind, getattr(reservation, RESOURCE_COLUMN[kind]), reservation.leader_id,
+                         reservation.end_at, end, exclude_id=reservation.id, member_ids=member_ids)
+
+
+def series_conflicts(kind, resource, student_id, spans, member_ids=()):
+    """여러 구간 [(start, end)...] 을 한 번에 검사 → {순번: (사유, 기존 예약 행)} — 쿼리 1번
+
+    같은 방/좌석 예약과 대표자·팀원의 다른 종류 예약을 UNION ALL 로 함께 읽고,
+    회차마다 find_conflict 와 같은 순서(사람 → "resource")로 판정한다.
+    """
+    if not spans:
+        return {}
+    Model = MODELS[kind]
+
+    def within(start_col, end_col):
+        return or_(*(and_(end_col > start, start_col < end) for start, end in spans))
+
+    resource_rows = select(
+        literal("resource").label("reason"), literal("").label("student_id"), Model.id, Model.date,
+        Model.hour, Model.duration, Model.start_at, Model.end_at,
+    ).where(getattr(Model, RESOURCE_COLUMN[kind]) == str(resource), within(Model.start_at, Model.end_at))
+    student_rows = select(
+        case((StudentBooking.student_id == student_id, "student"), else_="member").label("reason"),
+        StudentBooking.student_id, StudentBooking.reservation_id, StudentBooking.date,
+        StudentBooking.hour, StudentBooking.duration, StudentBooking.start_at, StudentBooking.end_at,
+    ).where(
+        StudentBooking.student_id.in_([student_id, *member_ids]),
+        StudentBooking.kind == OTHER_KIND[kind],
+        within(StudentBooking.start_at, StudentBooking.end_at),
+    )
+    queries = [resource_rows, student_rows]
+    if kind == "personal":
+        first, last = min(s for s, _ in spans), max(e for _, e in spans)
+        queries.append(_membership_rows(student_id, first, last, literal("member").label("reason"))
+                       .where(within(Reservation.start_at, Reservation.end_at)))
+
+    found = {"resource": [], "people": []}
+    for row in db.session.execute(union_all(*queries)):
+        found["resource" if row.reason == "resource" else "people"].append((row.start_at, row.end_at, row))
+    indexes = {source: IntervalIndex(items) for source, items in found.items()}
+
+    conflicts = {}
+    for i, (start, end) in enumerate(spans):
+        for source in ("people", "resource"):
+            existing = indexes[source].first(start, end)
+            if existing is not None:
+                conflicts[i] = (existing.reason, existing)
+                break
+    return conflicts
@@ -0,0 +1,75 @@
+"""✅ DB 엔진 옵션 (환경변수 기반) + 연결 예열
+
+Postgres (Railway)
+- DB_POOL_SIZE (기본 = GUNICORN_THREADS 또는 8): 워커 1개의 상시 연결 수
+- DB_MAX_OVERFLOW (기본 2): 순간 초과 허용 연결 수
+- DB_POOL_TIMEOUT (기본 10초): 풀이 비었을 때 대기 한도
+- DB_POOL_RECYCLE (기본 1800초): 이보다 오래된 연결은 새로 염 (유휴 후 끊긴 연결 방지)
+- DB_STATEMENT_TIMEOUT_MS (기본 5000, 0이면 끔): 쿼리 1개 실행 한도
+- pre_ping 항상 켬 → DB가 잠든 뒤 첫 요청도 죽은 연결을 받지 않음
+
+SQLite (로컬)
+- WAL 저널 + busy_timeout(DB_BUSY_TIMEOUT_MS, 기본 5000) → 읽기/쓰기 동시 진행, 잠금 시 대기
+
+DB_WARM_CONNECTIONS (기본 2): 워커가 요청을 받기 전에 미리 열어 둘 연결 수
+"""
+import os
+
+from sqlalchemy import event, text
+
+from db import db
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def engine_options(database_url):
+    """app.config["SQLALCHEMY_ENGINE_OPTIONS"] 값"""
+    if database_url.startswith("sqlite"):
+        return {"pool_pre_ping": True}
+
+    options = {
+        "pool_pre_ping": True,
+        "pool_size": _env_int("DB_POOL_SIZE", os.getenv("GUNICORN_THREADS", 8)),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 2),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    }
+    statement_timeout = _env_int("DB_STATEMENT_TIMEOUT_MS", 5000)
+    if statement_timeout > 0 and database_url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
+def _sqlite_pragmas(dbapi_conn, connection_record):
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={_env_int('DB_BUSY_TIMEOUT_MS', 5000)}")
+    cursor.close()
+
+
+def init_engine(app):
+    """엔진 생성 직후 방언별 연결 설정 등록"""
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _sqlite_pragmas)
+
+
+def warm_up(app, count=None):
+    """풀에 연결 count개를 미리 열어 둠 → 열린 연결 수"""
+    count = _env_int("DB_WARM_CONNECTIONS", 2) if count is None else count
+    if count <= 0:
+        return 0
+    with app.app_context():
+        connections = []
+        try:
+            for _ in range(count):
+                conn = db.engine.connect()
+                conn.execute(text("SELECT 1"))
+                connections.append(conn)
+        finally:
+            for conn in connections:
+                conn.close()  # 풀로 반환 (실제 연결은 유지)
+    return len(connections)
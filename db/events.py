@@ -0,0 +1,52 @@
+"""✅ 예약 변경 이벤트 기록 (쓰기 쪽)
+
+예약/연장/취소 트랜잭션 안에서 slot_events 행을 추가한다. 커밋되어야 보이므로
+구독자는 롤백된 변경을 절대 받지 않는다. Postgres에서는 NOTIFY도 함께 보내
+(역시 커밋 시점에 전달) 구독 스레드가 폴링 없이 바로 깨어난다.
+"""
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+
+from db import db
+from db.models import SlotEvent
+
+CHANNEL = "slot_events"
+
+
+def group_slots(slots):
+    """[datetime...] → [["YYYY-MM-DD", [시간...]], ...] (날짜 순)"""
+    grouped = {}
+    for slot_at in slots:
+        grouped.setdefault(slot_at.date().isoformat(), []).append(slot_at.hour)
+    return [[day, hours] for day, hours in sorted(grouped.items())]
+
+
+def publish(kind, resource, op, slots, label=None):
+    """op: "booked" / "released" (커밋은 호출자가)"""
+    payload = {
+        "kind": kind,
+        "resource": str(resource),
+        "op": op,
+        "slots": group_slots(slots),
+    }
+    if label is not None:
+        payload["label"] = label
+    db.session.add(SlotEvent(kind=kind, resource=str(resource), payload=json.dumps(payload, ensure_ascii=False)))
+
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("SELECT pg_notify(:channel, :resource)"),
+                           {"channel": CHANNEL, "resource": f"{kind}:{resource}"})
+
+
+def latest_event_id():
+    return db.session.query(func.max(SlotEvent.id)).scalar() or 0
+
+
+def prune_events(max_age_hours=24):
+    """오래된 이벤트 삭제 → 삭제 수"""
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    deleted = SlotEvent.query.filter(SlotEvent.created_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -1,3 +1,5 @@
+from datetime import datetime, time, timedelta
+
 from db import db
 
 class Reservation(db.Model):
@@ -5,13 +7,14 @@ class Reservation(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     room = db.Column(db.String(20), nullable=False)
-    date = db.Column(db.String(20), nullable=False)
-    hour = db.Column(db.String(20), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    hour = db.Column(db.SmallInteger, nullable=False)
 
     leader_name = db.Column(db.String(50), nullable=False)
     leader_id = db.Column(db.String(50), nullable=False)
     leader_phone = db.Column(db.String(50), nullable=False)
 
+    # 예전 팀원 칸 (읽기 전용) — 팀원은 reservation_members 에 저장
     member_1_name = db.Column(db.String(50))
     member_1_id = db.Column(db.String(50))
     member_2_name = db.Column(db.String(50))
@@ -24,12 +27,37 @@ class Reservation(db.Model):
     member_5_id = db.Column(db.String(50))
 
     total_people = db.Column(db.Integer)
-    duration = db.Column(db.Integer)
+    duration = db.Column(db.SmallInteger)
+
+    # ✅ 예약 구간 [start_at, end_at) — KST 기준, 저장 시 자동 계산
+    start_at = db.Column(db.DateTime, nullable=False)
+    end_at = db.Column(db.DateTime, nullable=False)
 
     # ✅ 인덱스 추가
     __table_args__ = (
         db.Index("ix_resv_room_date", "room", "date"),
         db.Index("ix_resv_leader_date", "leader_id", "date"),
+        db.Index("ix_resv_room_end", "room", "end_at"),
+        db.Index("ix_resv_leader_end", "leader_id", "end_at"),
+        # 보관으로 최대 id 행이 빠져도 id를 재사용하지 않음 (reservations_archive 와 id 충돌 방지)
+        {"sqlite_autoincrement": True},
+    )
+
+
+class ReservationMember(db.Model):
+    """✅ 단체 예약의 팀원 (대표자 제외) — (student_id, date) 인덱스로 팀원 겹침 검사"""
+    __tablename__ = "reservation_members"
+
+    id = db.Column(db.Integer, primary_key=True)
+    reservation_id = db.Column(db.Integer, db.ForeignKey("reservations.id", ondelete="CASCADE"), nullable=False)
+    student_id = db.Column(db.String(50), nullable=False)
+    name = db.Column(db.String(50))
+    date = db.Column(db.Date, nullable=False)  # 예약 시작 날짜 (reservations.date)
+
+    __table_args__ = (
+        db.Index("ix_members_student_date", "student_id", "date"),
+        db.Index("ix_members_reservation", "reservation_id"),
+        {"sqlite_autoincrement": True},
     )
 
 
@@ -38,16 +66,168 @@ class PersonalReservation(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     seat = db.Column(db.String(10), nullable=False)  # 좌석 번호 1~7
-    date = db.Column(db.String(20), nullable=False)
-    hour = db.Column(db.String(10), nullable=False)
-    duration = db.Column(db.Integer, default=1)
+    date = db.Column(db.Date, nullable=False)
+    hour = db.Column(db.SmallInteger, nullable=False)
+    duration = db.Column(db.SmallInteger, default=1)
     leader_name = db.Column(db.String(50), nullable=False)
     leader_id = db.Column(db.String(20), nullable=False)
     leader_phone = db.Column(db.String(20), nullable=False)
     total_people = db.Column(db.Integer, default=1)
 
+    # ✅ 예약 구간 [start_at, end_at) — KST 기준, 저장 시 자동 계산
+    start_at = db.Column(db.DateTime, nullable=False)
+    end_at = db.Column(db.DateTime, nullable=False)
+
     # ✅ 인덱스 추가
     __table_args__ = (
         db.Index("ix_pers_seat_date", "seat", "date"),
         db.Index("ix_pers_leader_date", "leader_id", "date"),
+        db.Index("ix_pers_seat_end", "seat", "end_at"),
+        db.Index("ix_pers_leader_end", "leader_id", "end_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+
+def booking_span(date, hour, duration):
+    """date·hour·duration → [start_at, end_at)"""
+    start_at = datetime.combine(date, time(int(hour)))
+    return start_at, start_at + timedelta(hours=int(duration or 1))
+
+
+@db.event.listens_for(Reservation, "before_insert")
+@db.event.listens_for(Reservation, "before_update")
+@db.event.listens_for(PersonalReservation, "before_insert")
+@db.event.listens_for(PersonalReservation, "before_update")
+def _sync_span(mapper, connection, target):
+    target.start_at, target.end_at = booking_span(target.date, target.hour, target.duration)
+
+
+class SlotClaim(db.Model):
+    """✅ 시간 단위 점유 기록 — (종류, 자원, 시각) 유일 인덱스로 중복 예약을 DB에서 차단"""
+    __tablename__ = "slot_claims"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)        # "group" / "personal"
+    resource = db.Column(db.String(20), nullable=False)    # 방 번호 / 좌석 번호
+    slot_at = db.Column(db.DateTime, nullable=False)       # 해당 1시간의 시작 시각 (KST)
+    student_id = db.Column(db.String(50), nullable=False)  # 대표자 학번
+    reservation_id = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index("ux_claim_slot", "kind", "resource", "slot_at", unique=True),
+        db.Index("ix_claim_student_slot", "student_id", "slot_at"),
+        db.Index("ix_claim_reservation", "kind", "reservation_id"),
     )
+
+
+class StudentBooking(db.Model):
+    """✅ 학생별 예약 목록 (단체+개인 통합, 예약/연장/취소 때 함께 갱신)
+
+    "오늘 이후 내 예약 전체"를 (student_id, start_at) 인덱스 범위 조회 한 번으로 읽는다.
+    Postgres에서는 표시용 컬럼을 INCLUDE 해서 테이블을 읽지 않는 index-only scan이 된다.
+    """
+    __tablename__ = "student_bookings"
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.String(50), nullable=False)  # 대표자 학번
+    start_at = db.Column(db.DateTime, nullable=False)
+    end_at = db.Column(db.DateTime, nullable=False)
+    kind = db.Column(db.String(10), nullable=False)        # "group" / "personal"
+    reservation_id = db.Column(db.Integer, nullable=False)
+    resource = db.Column(db.String(20), nullable=False)    # 방 번호 / 좌석 번호
+    date = db.Column(db.Date, nullable=False)
+    hour = db.Column(db.SmallInteger, nullable=False)
+    duration = db.Column(db.SmallInteger, nullable=False)
+    leader_name = db.Column(db.String(50), nullable=False)
+    leader_phone = db.Column(db.String(50), nullable=False)
+
+    __table_args__ = (
+        db.Index(
+            "ix_student_bookings_student_start", "student_id", "start_at",
+            postgresql_include=["leader_name", "leader_phone", "kind", "reservation_id",
+                                "resource", "date", "hour", "duration", "end_at"],
+        ),
+        db.Index("ux_student_bookings_reservation", "kind", "reservation_id", unique=True),
+    )
+
+
+class Resource(db.Model):
+    """✅ 자원 목록 (프로젝트실/개인석) — 코드 수정 없이 다른 층·건물의 방/좌석을 추가"""
+    __tablename__ = "resources"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)        # "group" / "personal"
+    code = db.Column(db.String(20), nullable=False)        # 예약 행의 room / seat 값
+    name = db.Column(db.String(50), nullable=False)        # 화면 표시 이름
+    building = db.Column(db.String(50), nullable=False)
+    floor = db.Column(db.SmallInteger)
+    capacity = db.Column(db.SmallInteger, nullable=False, default=1)
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    sort_order = db.Column(db.SmallInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ux_resources_kind_code", "kind", "code", unique=True),
+        db.Index("ix_resources_search", "kind", "active", "building", "capacity"),
+    )
+
+
+class ResourceVersion(db.Model):
+    """✅ 자원별 변경 버전 — 예약/연장/취소 때마다 +1 (캐시 키·ETag에 사용)"""
+    __tablename__ = "resource_versions"
+
+    kind = db.Column(db.String(10), primary_key=True)      # "group" / "personal"
+    resource = db.Column(db.String(20), primary_key=True)  # 방 번호 / 좌석 번호
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UtilizationHour(db.Model):
+    """✅ 이용률 집계 — (종류, 자원, 날짜, 시) 칸의 예약된 시간 수 (예약/연장/취소 때 증감)"""
+    __tablename__ = "utilization_hours"
+
+    kind = db.Column(db.String(10), primary_key=True)      # "group" / "personal"
+    resource = db.Column(db.String(20), primary_key=True)  # 방 번호 / 좌석 번호
+    date = db.Column(db.Date, primary_key=True)
+    hour = db.Column(db.SmallInteger, primary_key=True)
+    booked = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_utilization_date", "date"),
+    )
+
+
+class SlotEvent(db.Model):
+    """✅ 시간 단위 변경 이벤트 (실시간 갱신용) — 예약 트랜잭션과 함께 커밋됨"""
+    __tablename__ = "slot_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)
+    resource = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_event_resource_id", "kind", "resource", "id"),
+    )
+
+
+def _archive_table(live, *indexes):
+    """live 테이블과 같은 컬럼(FK 제외) + archived_at — 보관 기간이 지난 행을 옮겨 두는 테이블"""
+    columns = [
+        db.Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable, autoincrement=False)
+        for c in live.columns
+    ]
+    return db.Table(
+        f"{live.name}_archive", db.metadata,
+        *columns,
+        db.Column("archived_at", db.DateTime, nullable=False),
+        *indexes,
+    )
+
+
+# ✅ 지난 예약 보관 (flask --app app archive-reservations) — 리포트용, 예약 경로에서는 읽지 않음
+reservations_archive = _archive_table(
+    Reservation.__table__, db.Index("ix_resv_archive_room_date", "room", "date"))
+personal_reservations_archive = _archive_table(
+    PersonalReservation.__table__, db.Index("ix_pers_archive_seat_date", "seat", "date"))
+reservation_members_archive = _archive_table(
+    ReservationMember.__table__, db.Index("ix_members_archive_student_date", "student_id", "date"))
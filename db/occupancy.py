@@ -0,0 +1,159 @@
+"""✅ 점유 비트맵 엔진
+
+자원(프로젝트실/개인석)별·날짜별로 24비트 마스크(비트 h = h시 예약됨)와
+예약자 라벨 테이블을 유지한다. 자정을 넘긴 예약은 다음날 마스크로 자동 분배된다.
+"""
+from datetime import timedelta
+
+from sqlalchemy import literal, select, union_all
+
+from db import db
+from db.models import Reservation, PersonalReservation
+from services.logs import get_logger
+
+log = get_logger("occupancy")
+
+HOURS_PER_DAY = 24
+FULL_DAY = (1 << HOURS_PER_DAY) - 1
+HOUR_LABELS = [f"{h:02d}:00 ~ {(h + 1) % HOURS_PER_DAY:02d}:00" for h in range(HOURS_PER_DAY)]
+
+# 예약 종류 → (모델, 자원 컬럼 이름)
+RESOURCE_COLUMNS = {
+    "group": (Reservation, "room"),
+    "personal": (PersonalReservation, "seat"),
+}
+
+
+def span_mask(start_hour, duration):
+    """start_hour시부터 duration시간 → 하위 24비트가 당일, 그 위가 다음날인 마스크"""
+    return ((1 << duration) - 1) << start_hour
+
+
+def iter_hours(mask):
+    """마스크에서 켜진 비트(시간)를 오름차순으로 반환"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def owner_label(leader_id, leader_name):
+    """표에 표시할 예약자 라벨 (학번 + 이름)"""
+    rname = (leader_name or "").strip()
+    rid = (leader_id or "").strip().upper()
+    return f"{rid} {rname}" if rname and rname != rid else rid
+
+
+class Occupancy:
+    """자원별·날짜별 24비트 점유 마스크 + 예약자 라벨 테이블"""
+
+    def __init__(self, days):
+        self.days = list(days)
+        # 창 첫날의 전날(-1)도 인덱스에 포함 → 전날 밤 예약의 자정 넘김 반영
+        self._index = {self.days[0] - timedelta(days=1): -1}
+        self._index.update({d: i for i, d in enumerate(self.days)})
+        self._masks = {}
+        self._owners = {}
+        self._labels = []
+        self._label_ids = {}
+
+    @property
+    def load_dates(self):
+        """DB에서 읽어야 할 날짜 목록 (전날 + 표시 창, 오름차순)"""
+        return list(self._index)
+
+    def _label_id(self, label):
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = self._label_ids[label] = len(self._labels)
+            self._labels.append(label)
+        return label_id
+
+    def add(self, resource, date, hour, duration, label=""):
+        """예약 한 건을 마스크에 반영 → 반영했으면 True
+
+        창 밖 날짜, 0~23 밖의 시각, 1시간 미만 duration 인 행은 건너뛴다 (행 하나 때문에 표 전체가 깨지지 않게).
+        """
+        i = self._index.get(date)
+        if i is None:
+            return False
+        if hour is None or not 0 <= hour < HOURS_PER_DAY or duration < 1:
+            return False
+        resource = str(resource)
+        masks = self._masks.get(resource)
+        if masks is None:
+            masks = self._masks[resource] = [0] * len(self.days)
+            self._owners[resource] = [[] for _ in self.days]
+        owners = self._owners[resource]
+        label_id = self._label_id(label)
+
+        span = span_mask(hour, duration)
+        while span and i < len(self.days):
+            bits = span & FULL_DAY
+            if bits and i >= 0:
+                masks[i] |= bits
+                owners[i].append((bits, label_id))
+            span >>= HOURS_PER_DAY
+            i += 1
+        return True
+
+    def masks(self, resource):
+        """{날짜: 마스크}"""
+        masks = self._masks.get(str(resource)) or [0] * len(self.days)
+        return dict(zip(self.days, masks))
+
+    def cells(self, resource):
+        """{날짜: [시간별 예약자 라벨 또는 None] * 24} — 템플릿 표시용"""
+        owners = self._owners.get(str(resource))
+        result = {}
+        for i, d in enumerate(self.days):
+            row = [None] * HOURS_PER_DAY
+            if owners:
+                for bits, label_id in owners[i]:
+                    label = self._labels[label_id]
+                    for h in iter_hours(bits):
+                        row[h] = label
+            result[d] = row
+        return result
+
+    def rows(self, resource):
+        """[(시, "HH:00 ~ HH:00", [(날짜, 라벨 또는 None)...])] * 24 — 예약표 템플릿용 (행 순서 그대로)"""
+        columns = list(self.cells(resource).items())
+        return [
+            (h, HOUR_LABELS[h], [(d, row[h]) for d, row in columns])
+            for h in range(HOURS_PER_DAY)
+        ]
+
+
+def _window_query(kind, resources, load_dates):
+    Model, column = RESOURCE_COLUMNS[kind]
+    resource_col = getattr(Model, column)
+    return select(
+        literal(kind).label("kind"), resource_col.label("resource"), Model.date, Model.hour,
+        Model.duration, Model.leader_id, Model.leader_name
+    ).where(
+        resource_col.in_([str(r) for r in resources]),
+        Model.date.between(load_dates[0], load_dates[-1])
+    )
+
+
+def load_occupancies(targets, days):
+    """{종류: [자원...]} → {종류: Occupancy} — 두 테이블을 UNION ALL 한 번의 쿼리로 조회"""
+    occs = {kind: Occupancy(days) for kind in targets}
+    load_dates = next(iter(occs.values())).load_dates
+    queries = [_window_query(kind, resources, load_dates) for kind, resources in targets.items() if resources]
+    if not queries:
+        return occs
+
+    stmt = queries[0] if len(queries) == 1 else union_all(*queries)
+    for kind, resource, date, hour, duration, leader_id, leader_name in db.session.execute(stmt):
+        if not occs[kind].add(resource, date, hour, duration or 1, owner_label(leader_id, leader_name)):
+            log.warning("skipped invalid reservation row",
+                        extra={"kind": kind, "resource": resource, "date": str(date), "hour": hour, "duration": duration})
+
+    return occs
+
+
+def load_occupancy(kind, resources, days):
+    """종류(group/personal)의 자원들에 대해 days 창의 점유 현황을 한 번의 쿼리로 계산"""
+    return load_occupancies({kind: resources}, days)[kind]
@@ -0,0 +1,155 @@
+"""✅ 자원 목록(resources) + 빈 자리 검색
+
+프로젝트실/개인석을 코드가 아닌 resources 테이블로 관리한다 (flask --app app add-resource).
+예약 행의 room / seat 값이 resources.code 와 같다.
+
+빈 자리 검색: 후보 자원의 [시작, 끝) 창 안 예약을 UNION ALL 쿼리 1번으로 읽어
+자원별 시간 비트맵(비트 i = 시작+i시 예약됨)을 만들고, 연속 N시간 빈 구간을 비트 연산으로 찾는다.
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from sqlalchemy import literal, select, union_all
+
+from db import db
+from db.models import Resource
+from db.occupancy import RESOURCE_COLUMNS, iter_hours
+
+HOUR = timedelta(hours=1)
+DEFAULT_BUILDING = "산업·데이터공학과"
+
+# 기존에 코드로 박혀 있던 방/좌석 — 새 DB를 만들 때 한 번 채움
+DEFAULT_RESOURCES = [
+    *({"kind": "group", "code": str(i), "name": f"프로젝트실 {i}", "capacity": 6, "sort_order": i}
+      for i in range(1, 3)),
+    *({"kind": "personal", "code": str(i), "name": f"개인석 {i}", "capacity": 1, "sort_order": i}
+      for i in range(1, 8)),
+]
+
+FreeResource = namedtuple("FreeResource", "resource starts")  # starts: 예약 가능한 시작 시각 목록
+
+
+def seed_resources():
+    """DEFAULT_RESOURCES 중 없는 것만 추가 → 추가한 수"""
+    existing = set(db.session.execute(select(Resource.kind, Resource.code)).all())
+    rows = [
+        Resource(building=DEFAULT_BUILDING, **spec)
+        for spec in DEFAULT_RESOURCES
+        if (spec["kind"], spec["code"]) not in existing
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return len(rows)
+
+
+def upsert_resource(kind, code, **fields):
+    """(kind, code) 자원을 추가하거나 값 변경 (커밋은 호출자가) → Resource"""
+    resource = Resource.query.filter_by(kind=kind, code=str(code)).first()
+    if resource is None:
+        resource = Resource(kind=kind, code=str(code))
+        db.session.add(resource)
+    for name, value in fields.items():
+        if value is not None:
+            setattr(resource, name, value)
+    if resource.name is None:
+        resource.name = str(code)
+    return resource
+
+
+def list_resources(kind=None, building=None, min_capacity=None, active_only=True):
+    """조건에 맞는 자원 목록 (종류 → 정렬 순서 → 코드 순)"""
+    query = Resource.query
+    if kind:
+        query = query.filter(Resource.kind == kind)
+    if active_only:
+        query = query.filter(Resource.active.is_(True))
+    if building:
+        query = query.filter(Resource.building == building)
+    if min_capacity:
+        query = query.filter(Resource.capacity >= min_capacity)
+    return query.order_by(Resource.kind, Resource.sort_order, Resource.code).all()
+
+
+def catalog_codes(kinds=("group", "personal")):
+    """{종류: [코드...]} — 사용 중인 자원만"""
+    codes = {kind: [] for kind in kinds}
+    for r in list_resources():
+        if r.kind in codes:
+            codes[r.kind].append(r.code)
+    return codes
+
+
+def get_resource(kind, code):
+    """사용 중인 (kind, code) 자원, 없으면 None"""
+    if code is None:
+        return None
+    return Resource.query.filter_by(kind=kind, code=str(code), active=True).first()
+
+
+def buildings():
+    """자원이 있는 건물 이름 목록"""
+    rows = db.session.execute(
+        select(Resource.building).where(Resource.active.is_(True)).distinct().order_by(Resource.building)
+    )
+    return [b for (b,) in rows]
+
+
+def busy_masks(targets, start, hours):
+    """{종류: [코드...]} → {(종류, 코드): 마스크} — [start, start+hours) 중 예약된 시간 비트 (쿼리 1번)
+
+    (room|seat, end_at) 인덱스 범위 조회라 자정을 넘기는 예약도 start_at/end_at 그대로 비교한다.
+    """
+    end = start + hours * HOUR
+    queries = []
+    for kind, codes in targets.items():
+        if not codes:
+            continue
+        Model, column = RESOURCE_COLUMNS[kind]
+        resource_col = getattr(Model, column)
+        queries.append(select(
+            literal(kind).label("kind"), resource_col.label("resource"), Model.start_at, Model.end_at
+        ).where(resource_col.in_(codes), Model.end_at > start, Model.start_at < end))
+
+    masks = {}
+    if not queries:
+        return masks
+    stmt = queries[0] if len(queries) == 1 else union_all(*queries)
+    for kind, resource, start_at, end_at in db.session.execute(stmt):
+        lo = max(0, int((start_at - start) // HOUR))
+        hi = min(hours, -int((start - end_at) // HOUR))  # 올림
+        if hi > lo:
+            key = (kind, resource)
+            masks[key] = masks.get(key, 0) | (((1 << (hi - lo)) - 1) << lo)
+    return masks
+
+
+def free_runs(busy, hours, duration):
+    """busy 마스크에서 연속 duration시간이 비는 시작 위치들의 마스크 (비트 i = i시간 뒤 시작 가능)"""
+    free = ((1 << hours) - 1) & ~busy
+    runs = free
+    for i in range(1, duration):
+        runs &= free >> i
+    return runs
+
+
+def free_resources(start, end, duration, kind=None, building=None, min_capacity=None):
+    """[start, end) 창 안에서 연속 duration시간 예약 가능한 자원 → [FreeResource] (자원 목록 순)
+
+    start/end 는 정시 KST (naive). 쿼리: 자원 목록 1번 + 창 안 예약 1번.
+    """
+    hours = int((end - start) // HOUR)
+    if duration < 1 or duration > hours:
+        return []
+
+    candidates = list_resources(kind, building, min_capacity)
+    targets = {}
+    for r in candidates:
+        targets.setdefault(r.kind, []).append(r.code)
+    masks = busy_masks(targets, start, hours)
+
+    found = []
+    for r in candidates:
+        runs = free_runs(masks.get((r.kind, r.code), 0), hours, duration)
+        if runs:
+            found.append(FreeResource(r, [start + i * HOUR for i in iter_hours(runs)]))
+    return found
@@ -0,0 +1,194 @@
+"""✅ 스키마 관리 — 테이블 생성 / 시퀀스 보정"""
+from datetime import date
+
+from sqlalchemy import inspect, text, String
+
+from db import db
+from db.models import booking_span
+
+# 문자열 date/hour → Date/SmallInteger + start_at/end_at 전환 대상
+TYPED_TABLES = ("reservations", "personal_reservations")
+# *_archive 로 행을 옮기는 테이블 — id가 뒤로 가면 보관 테이블의 id와 겹침
+ARCHIVED_TABLES = ("reservations", "personal_reservations", "reservation_members")
+
+
+def init_schema():
+    """테이블 생성 + 타입 전환 + 시퀀스 보정 (배포 시 1회: flask --app app init-db)
+
+    → {"created": [...], "upgraded": [...], "sequences": [...]}
+    """
+    from db import models  # noqa: F401 — 모델을 metadata에 등록
+
+    existing = set(inspect(db.engine).get_table_names())
+    # 타입 전환을 먼저: SQLite 재구성(RENAME) 중에 새로 만든 테이블의 FK가 옛 테이블 이름으로 바뀌지 않도록
+    upgraded = upgrade_typed_columns()
+    db.create_all()
+    created = [t.name for t in db.metadata.sorted_tables if t.name not in existing]
+    upgraded += upgrade_autoincrement()
+    if "slot_claims" in created:
+        # 기존 예약의 시간 점유 — 비어 있으면 유일 인덱스가 기존 예약과의 겹침을 막지 못함
+        from db.booking import rebuild_claims
+        rebuild_claims()
+    if "student_bookings" in created:
+        # 기존 예약이 있는 DB에 새로 생긴 경우 1회 채움
+        from db.booking import rebuild_student_bookings
+        rebuild_student_bookings()
+    if "reservation_members" in created:
+        # 예전 member_N 칸에 들어 있던 팀원을 옮김
+        from db.booking import backfill_members
+        backfill_members()
+    if "utilization_hours" in created:
+        # 기존 예약(live + archive)으로 이용률 집계 채움
+        from db.utilization import rebuild_utilization
+        rebuild_utilization()
+    if "resources" in created:
+        # 기존 프로젝트실 1~2 / 개인석 1~7 을 자원 목록에 등록
+        from db.resources import seed_resources
+        seed_resources()
+    return {"created": created, "upgraded": upgraded, "sequences": repair_sequences()}
+
+
+def repair_sequences():
+    """id 시퀀스를 각 테이블의 MAX(id)에 맞춤 (수동 INSERT/복원 후 1회 실행, 부팅 시 init-db도 실행)
+
+    예약 경로에서는 일반 시퀀스 할당만 사용하므로, 시퀀스 보정은 시작/마이그레이션 시점에만 한다.
+    보관 테이블이 있으면 그쪽 MAX(id)까지 포함 — 보관으로 최대 id 행이 빠져도 id가 뒤로 가지 않게.
+    Postgres: setval / SQLite: sqlite_sequence (AUTOINCREMENT 인 보관 대상 테이블만)
+    """
+    postgres = db.engine.dialect.name == "postgresql"
+    repaired = []
+    for table in db.metadata.sorted_tables:
+        if "id" not in table.c or not table.c.id.primary_key or table.name.endswith("_archive"):
+            continue
+        if not postgres and table.name not in ARCHIVED_TABLES:
+            continue
+        floor = max_id_sql(table.name)
+        if postgres:
+            db.session.execute(text(f"""
+                SELECT setval(
+                  pg_get_serial_sequence('{table.name}', 'id'),
+                  COALESCE(({floor}), 1),
+                  ({floor}) IS NOT NULL
+                )"""))
+        else:
+            db.session.execute(text(f"""
+                UPDATE sqlite_sequence SET seq = ({floor})
+                 WHERE name = '{table.name}' AND seq < ({floor})"""))
+            db.session.execute(text(f"""
+                INSERT INTO sqlite_sequence (name, seq)
+                SELECT '{table.name}', ({floor})
+                 WHERE ({floor}) IS NOT NULL
+                   AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = '{table.name}')"""))
+        repaired.append(table.name)
+    db.session.commit()
+    return repaired
+
+
+def max_id_sql(name):
+    """name 과 (있으면) name_archive 를 합친 MAX(id) 스칼라 SQL — 테이블마다 PK 인덱스로 1번씩"""
+    if f"{name}_archive" not in db.metadata.tables:
+        return f"SELECT MAX(id) FROM {name}"
+    return f"SELECT MAX(m) FROM (SELECT MAX(id) AS m FROM {name} UNION ALL SELECT MAX(id) FROM {name}_archive) ids"
+
+
+def needs_autoincrement(table_name):
+    """SQLite: 보관 대상 테이블이 AUTOINCREMENT 없이 만들어졌으면 True (MAX(rowid)+1 로 id 재사용)"""
+    sql = db.session.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table_name}
+    ).scalar()
+    return sql is not None and "AUTOINCREMENT" not in sql.upper()
+
+
+def upgrade_autoincrement():
+    """SQLite: AUTOINCREMENT 없는 보관 대상 테이블을 새 스키마로 다시 만들고 행 복사 → 전환한 테이블 목록"""
+    if db.engine.dialect.name != "sqlite":
+        return []
+    upgraded = []
+    for name in ARCHIVED_TABLES:
+        if not needs_autoincrement(name):
+            continue
+        table = db.metadata.tables[name]
+        old_name = f"_{name}_old"
+        columns = ", ".join(c.name for c in table.columns)
+        db.session.remove()
+        with db.engine.begin() as conn:
+            for index in inspect(conn).get_indexes(name):
+                conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+            conn.execute(text("PRAGMA legacy_alter_table = ON"))
+            conn.execute(text(f"ALTER TABLE {name} RENAME TO {old_name}"))
+            conn.execute(text("PRAGMA legacy_alter_table = OFF"))
+            table.create(conn)
+            conn.execute(text(f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {old_name}"))
+            conn.execute(text(f"DROP TABLE {old_name}"))
+        upgraded.append(name)
+    return upgraded
+
+
+def needs_typed_upgrade(table_name):
+    """hour 컬럼이 아직 문자열이면 True"""
+    columns = {c["name"]: c for c in inspect(db.engine).get_columns(table_name)}
+    return isinstance(columns["hour"]["type"], String) or "start_at" not in columns
+
+
+def upgrade_typed_columns():
+    """date/hour를 Date/SmallInteger로 바꾸고 start_at/end_at을 채움 → 전환한 테이블 목록"""
+    upgraded = []
+    for name in TYPED_TABLES:
+        if not inspect(db.engine).has_table(name) or not needs_typed_upgrade(name):
+            continue
+        if db.engine.dialect.name == "postgresql":
+            _upgrade_postgres(name)
+        else:
+            _rebuild_table(name)
+        upgraded.append(name)
+    return upgraded
+
+
+def _upgrade_postgres(name):
+    """Postgres: 제자리 ALTER + 일괄 UPDATE (시퀀스·PK 유지)"""
+    table = db.metadata.tables[name]
+    with db.engine.begin() as conn:
+        conn.execute(text(f"""
+            ALTER TABLE {name}
+              ALTER COLUMN date TYPE DATE USING date::date,
+              ALTER COLUMN hour TYPE SMALLINT USING hour::smallint,
+              ALTER COLUMN duration TYPE SMALLINT USING COALESCE(duration, 1)::smallint,
+              ADD COLUMN IF NOT EXISTS start_at TIMESTAMP,
+              ADD COLUMN IF NOT EXISTS end_at TIMESTAMP"""))
+        conn.execute(text(f"""
+            UPDATE {name}
+               SET start_at = date + make_interval(hours => hour),
+                   end_at = date + make_interval(hours => hour + duration)"""))
+        conn.execute(text(f"""
+            ALTER TABLE {name}
+              ALTER COLUMN start_at SET NOT NULL,
+              ALTER COLUMN end_at SET NOT NULL"""))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _rebuild_table(name):
+    """SQLite 등: 컬럼 타입 변경이 안 되므로 새 스키마로 테이블을 다시 만들고 행을 복사"""
+    table = db.metadata.tables[name]
+    old_name = f"_{name}_old"
+    with db.engine.begin() as conn:
+        for index in inspect(conn).get_indexes(name):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+        # 다른 테이블의 FK(reservation_members → reservations)가 _old 로 따라가지 않게
+        conn.execute(text("PRAGMA legacy_alter_table = ON"))
+        conn.execute(text(f"ALTER TABLE {name} RENAME TO {old_name}"))
+        conn.execute(text("PRAGMA legacy_alter_table = OFF"))
+        table.create(conn)
+
+        old_rows = conn.execute(text(f"SELECT * FROM {old_name}")).mappings().all()
+        rows = []
+        for old in old_rows:
+            row = {c.name: old[c.name] for c in table.columns if c.name in old}
+            row["date"] = date.fromisoformat(str(old["date"]).strip())
+            row["hour"] = int(old["hour"])
+            row["duration"] = int(old["duration"] or 1)
+            row["start_at"], row["end_at"] = booking_span(row["date"], row["hour"], row["duration"])
+            rows.append(row)
+        if rows:
+            conn.execute(table.insert(), rows)
+        conn.execute(text(f"DROP TABLE {old_name}"))
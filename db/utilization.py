@@ -0,0 +1,115 @@
+"""✅ 이용률 집계 (자원 × 날짜 × 시간 → 예약된 시간 수)
+
+예약/연장/취소 트랜잭션 안에서 바뀐 시간칸만 +1 / -1 (UPSERT) 하므로
+리포트는 원본 예약을 훑지 않고 O(자원 × 날짜) 행만 읽는다.
+보관(archive)으로 옮겨진 예약도 집계는 그대로 남는다.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from db import db
+from db.archive import history
+from db.conflicts import MODELS
+from db.models import UtilizationHour
+from db.resources import list_resources
+
+HOURS_PER_DAY = 24
+MAX_REPORT_DAYS = 366
+
+
+def _insert():
+    """INSERT ... ON CONFLICT 를 지원하는 dialect별 insert (Postgres / SQLite)"""
+    if db.engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(UtilizationHour)
+
+
+def record_usage(kind, resource, slots, delta):
+    """slots(1시간 단위 시작 시각들) 칸의 예약 시간 수를 delta(+1 / -1)만큼 반영 (커밋은 호출자가)"""
+    if not slots:
+        return
+    rows = [
+        dict(kind=kind, resource=str(resource), date=slot_at.date(), hour=slot_at.hour, booked=delta)
+        for slot_at in slots
+    ]
+    stmt = _insert()
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=["kind", "resource", "date", "hour"],
+        set_={"booked": UtilizationHour.booked + stmt.excluded.booked},
+    ), rows)
+
+
+def rebuild_utilization(chunk=5000):
+    """예약 원본(live + archive) 전체로부터 집계 재구성 → 칸 수"""
+    from db.booking import slot_times  # db.booking 이 이 모듈을 import 하므로 지연 import
+
+    UtilizationHour.query.delete(synchronize_session=False)
+    cells = Counter()
+    for kind in MODELS:
+        for row in db.session.execute(history(kind)):
+            for slot_at in slot_times(row.date, row.hour, row.duration or 1):
+                cells[(kind, str(row.resource), slot_at.date(), slot_at.hour)] += 1
+
+    rows = [dict(kind=k, resource=r, date=d, hour=h, booked=n) for (k, r, d, h), n in cells.items()]
+    for i in range(0, len(rows), chunk):
+        db.session.execute(_insert(), rows[i:i + chunk])
+    db.session.commit()
+    return len(rows)
+
+
+def week_start(day):
+    """day가 속한 주의 월요일"""
+    return day - timedelta(days=day.weekday())
+
+
+def utilization_report(first, last, kind=None):
+    """first~last 자원별 이용률 → [dict] (자원 목록 순, 예약이 없던 자원도 포함)
+
+    dict: kind, code, name, building, booked_hours, available_hours, rate,
+          by_hour [(시, 예약 시간, 이용률)] * 24, by_week [(월요일, 예약 시간, 가능 시간, 이용률)]
+    집계 테이블 GROUP BY 2번 (시간대별 / 날짜별) + 자원 목록 1번.
+    """
+    def grouped(column):
+        stmt = select(
+            UtilizationHour.kind, UtilizationHour.resource, column, func.sum(UtilizationHour.booked)
+        ).where(UtilizationHour.date.between(first, last))
+        if kind:
+            stmt = stmt.where(UtilizationHour.kind == kind)
+        return db.session.execute(stmt.group_by(UtilizationHour.kind, UtilizationHour.resource, column)).all()
+
+    by_hour, by_date = {}, {}
+    for k, resource, hour, booked in grouped(UtilizationHour.hour):
+        by_hour.setdefault((k, resource), [0] * HOURS_PER_DAY)[hour] = int(booked)
+    for k, resource, day, booked in grouped(UtilizationHour.date):
+        weeks = by_date.setdefault((k, resource), Counter())
+        weeks[week_start(day)] += int(booked)
+
+    days = (last - first).days + 1
+    week_days = Counter(week_start(first + timedelta(days=i)) for i in range(days))
+
+    report = []
+    for r in list_resources(kind, active_only=False):
+        key = (r.kind, r.code)
+        hours = by_hour.get(key, [0] * HOURS_PER_DAY)
+        weeks = by_date.get(key, Counter())
+        booked = sum(hours)
+        available = days * HOURS_PER_DAY
+        report.append({
+            "kind": r.kind,
+            "code": r.code,
+            "name": r.name,
+            "building": r.building,
+            "booked_hours": booked,
+            "available_hours": available,
+            "rate": booked / available,
+            "by_hour": [(h, n, n / days) for h, n in enumerate(hours)],
+            "by_week": [
+                (monday, weeks[monday], n * HOURS_PER_DAY, weeks[monday] / (n * HOURS_PER_DAY))
+                for monday, n in sorted(week_days.items())
+            ],
+        })
+    return report
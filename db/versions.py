@@ -0,0 +1,45 @@
+"""✅ 자원별 변경 버전 관리
+
+예약 행이 바뀌는 트랜잭션 안에서 bump_version()을 호출하면 커밋과 동시에 버전이 오른다.
+여러 워커가 같은 DB 값을 보므로, 버전을 키에 넣은 캐시는 워커 간에도 정확히 무효화된다.
+"""
+import hashlib
+
+from sqlalchemy.exc import IntegrityError
+
+from db import db
+from db.models import ResourceVersion
+
+
+def bump_version(kind, resource):
+    """(kind, resource) 버전 +1 (커밋은 호출자가)"""
+    resource = str(resource)
+    query = ResourceVersion.query.filter_by(kind=kind, resource=resource)
+    if query.update({ResourceVersion.version: ResourceVersion.version + 1}, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(ResourceVersion(kind=kind, resource=resource, version=1))
+    except IntegrityError:
+        # 다른 워커가 먼저 행을 만든 경우
+        query.update({ResourceVersion.version: ResourceVersion.version + 1}, synchronize_session=False)
+
+
+def current_versions(kind, resources):
+    """{자원: 버전} — 한 번도 바뀌지 않은 자원은 0"""
+    resources = [str(r) for r in resources]
+    rows = db.session.query(ResourceVersion.resource, ResourceVersion.version).filter(
+        ResourceVersion.kind == kind,
+        ResourceVersion.resource.in_(resources),
+    ).all()
+    versions = dict.fromkeys(resources, 0)
+    versions.update(rows)
+    return versions
+
+
+def versions_etag(days, versions):
+    """표시 기간 + {종류: {자원: 버전}} → 강한 ETag 값 (버전 중 하나라도 바뀌면 달라짐)"""
+    parts = [days[0].isoformat(), str(len(days))]
+    for kind in sorted(versions):
+        parts += [f"{kind}:{r}:{v}" for r, v in sorted(versions[kind].items())]
+    return "av-" + hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
@@ -0,0 +1,44 @@
+"""✅ gunicorn 설정 (Procfile: gunicorn -c gunicorn.conf.py wsgi:app)
+
+- preload_app: 마스터가 앱을 한 번 import 한 뒤 워커를 fork → 워커 부팅은 fork 비용만
+- INIT_DB_ON_BOOT=1 (기본): 마스터가 fork 전에 init-db를 1회 실행 (워커마다 스키마 조회 없음)
+- PRECOMPRESS_STATIC=1 (기본): 마스터가 static/ 사전 압축본(.gz/.br)을 만들어 둠
+- 마스터가 템플릿을 미리 컴파일 → 워커는 첫 요청에서 컴파일하지 않음
+- 워커는 fork 직후 부모의 연결 풀을 버리고 DB_WARM_CONNECTIONS개를 새로 열어 둔 뒤 요청을 받음
+- gthread: 열린 SSE/롱폴링은 끝날 때까지 스레드 1개를 잡으므로 워커당 EVENT_MAX_STREAMS개
+  (기본: threads의 절반)까지만 받고, 나머지 스레드는 일반 요청용으로 남김 (services/events.py)
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+preload_app = os.getenv("PRELOAD_APP", "1") == "1"
+timeout = 60
+
+
+def when_ready(server):
+    from app import app
+    from services.templating import precompile
+    server.log.info("compiled %d templates", precompile(app))
+    if os.getenv("PRECOMPRESS_STATIC", "1") == "1":
+        server.log.info("build-static: %s", app.extensions["static_assets"].build())
+    if os.getenv("INIT_DB_ON_BOOT", "1") != "1":
+        return
+    from db import db
+    from db.schema import init_schema
+    with app.app_context():
+        result = init_schema()
+        db.session.remove()
+        db.engine.dispose()  # 마스터 연결은 워커에 물려주지 않음
+    server.log.info("init-db: %s", result)
+
+
+def post_fork(server, worker):
+    from app import app
+    from db import db
+    from db.engine import warm_up
+    with app.app_context():
+        db.engine.dispose(close=False)  # fork로 복사된 부모 연결은 닫지 않고 버림
+    worker.log.info("warmed %d db connections", warm_up(app))
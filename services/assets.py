@@ -0,0 +1,142 @@
+"""✅ 정적 파일 — 내용 해시 URL + 장기 캐시 + 사전 압축본
+
+- url_for('static', filename='wow.png') → /static/wow.3f2a9c01be.png (템플릿 수정 불필요)
+- 해시가 맞는 URL: Cache-Control: public, max-age=1년, immutable
+- 해시 없는/옛 해시 URL: 짧은 캐시 (STATIC_MAX_AGE, 기본 1시간) + ETag/304
+- 브라우저가 br/gzip을 받으면 미리 만들어 둔 wow.js.br / .gz를 대신 보냄
+  (flask --app app build-static 으로 생성, brotli 패키지가 있을 때만 .br)
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+COMPRESSIBLE = {".js", ".css", ".svg", ".json", ".txt", ".html", ".map"}
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+HASH_LENGTH = 10
+_FINGERPRINT = re.compile(rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<ext>\.[^./]+)$")
+
+
+class StaticAssets:
+    def __init__(self, static_dir, max_age=3600, watch=False):
+        self.static_dir = static_dir
+        self.max_age = max_age
+        self.watch = watch  # 디버그 모드: 파일 수정 시각이 바뀌면 해시 다시 계산
+        self._hashes = {}  # 파일 이름 → (mtime, 해시)
+        self._lock = threading.Lock()
+
+    # ---------------- URL ----------------
+    def digest(self, filename):
+        path = os.path.join(self.static_dir, filename)
+        cached = self._hashes.get(filename)
+        if cached is not None and not self.watch:
+            return cached[1]
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                cached = (mtime, hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH])
+            with self._lock:
+                self._hashes[filename] = cached
+        return cached[1]
+
+    def fingerprint(self, filename):
+        """wow.png → wow.<해시>.png (파일이 없으면 그대로)"""
+        digest = self.digest(filename)
+        if digest is None:
+            return filename
+        stem, ext = os.path.splitext(filename)
+        return f"{stem}.{digest}{ext}"
+
+    def url_defaults(self, endpoint, values):
+        if endpoint == "static" and "filename" in values:
+            values["filename"] = self.fingerprint(values["filename"])
+
+    # ---------------- 제공 ----------------
+    def resolve(self, filename):
+        """요청 경로 → (실제 파일 이름, 해시가 현재 내용과 일치하는지)"""
+        m = _FINGERPRINT.match(filename)
+        if m:
+            original = m["stem"] + m["ext"]
+            digest = self.digest(original)
+            if digest is not None:
+                return original, digest == m["hash"]
+        return filename, False
+
+    def _fresh_variant(self, filename, suffix):
+        """원본보다 오래되지 않은 압축본이 있으면 True (원본만 고치고 다시 빌드 안 한 경우 무시)"""
+        try:
+            return os.stat(os.path.join(self.static_dir, filename + suffix)).st_mtime >= \
+                os.stat(os.path.join(self.static_dir, filename)).st_mtime
+        except OSError:
+            return False
+
+    def serve(self, filename):
+        original, immutable = self.resolve(filename)
+        send_name, encoding = original, None
+        if os.path.splitext(original)[1] in COMPRESSIBLE:
+            accepted = request.accept_encodings
+            for name, suffix in ENCODINGS:
+                if accepted[name] and self._fresh_variant(original, suffix):
+                    send_name, encoding = original + suffix, name
+                    break
+
+        response = send_from_directory(
+            self.static_dir, send_name,
+            mimetype=mimetypes.guess_type(original)[0],
+            max_age=self.max_age,
+            conditional=True, etag=True,
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if os.path.splitext(original)[1] in COMPRESSIBLE:
+            response.vary.add("Accept-Encoding")
+        if immutable:
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+    # ---------------- 빌드 ----------------
+    def build(self):
+        """압축 가능한 파일마다 .gz (+ .br) 생성 → 생성한 파일 이름 목록"""
+        built = []
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                if os.path.splitext(name)[1] not in COMPRESSIBLE:
+                    continue
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    data = f.read()
+                variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+                if brotli is not None:
+                    variants[".br"] = brotli.compress(data, quality=11)
+                for suffix, body in variants.items():
+                    if len(body) >= len(data):
+                        continue
+                    with open(path + suffix, "wb") as f:
+                        f.write(body)
+                    built.append(os.path.relpath(path + suffix, self.static_dir))
+        return built
+
+
+def init_app(app):
+    assets = StaticAssets(
+        app.static_folder,
+        max_age=int(os.getenv("STATIC_MAX_AGE", "3600")),
+        watch=app.debug or os.getenv("FLASK_DEBUG") == "1",
+    )
+    app.extensions["static_assets"] = assets
+    app.url_defaults(assets.url_defaults)
+    app.view_functions["static"] = assets.serve
+    return assets
@@ -0,0 +1,178 @@
+"""✅ 예약표 읽기 캐시 (read-through)
+
+(배포 버전, 종류, 조각 이름, 자원, 표시 기간, 자원 버전)마다 점유 마스크와 렌더링된 표 HTML 조각을 저장한다.
+- 예약/연장/취소가 자원 버전을 올리면 해당 자원의 키만 바뀌므로 정확히 무효화된다.
+- 키에 표시 첫날(KST 오늘)이 들어가므로 자정이 지나면 자동으로 새 키를 쓴다.
+- 조각 이름(namespace)으로 같은 자원의 다른 조각(상세 표 / 좌석 카드)을 구분한다.
+- 배포 버전(GRID_CACHE_RELEASE, 기본: 템플릿 내용 해시)이 바뀌면 Redis에 남은 옛 마크업을 쓰지 않는다.
+
+백엔드: GRID_CACHE_BACKEND = "lru"(기본, 워커 내 메모리) | "redis"(GRID_CACHE_URL) | "none"
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from db.occupancy import load_occupancy
+from db.versions import current_versions
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class LRUBackend:
+    """워커 프로세스 내 LRU 캐시"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisBackend:
+    """여러 워커가 공유하는 Redis 캐시 (redis 패키지 필요)"""
+
+    def __init__(self, url, prefix="grid:"):
+        import redis
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key):
+        raw = self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self._prefix + key, json.dumps(value), ex=ttl)
+
+    def clear(self):
+        for key in self._client.scan_iter(self._prefix + "*"):
+            self._client.delete(key)
+
+    def __len__(self):
+        return sum(1 for _ in self._client.scan_iter(self._prefix + "*"))
+
+
+class NullBackend:
+    """캐시 끔"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+def make_backend(name, size=512, url=None):
+    if name == "redis":
+        return RedisBackend(url)
+    if name == "none":
+        return NullBackend()
+    return LRUBackend(size)
+
+
+class GridCache:
+    """자원별 예약표 read-through 캐시 + hit/miss 카운터"""
+
+    def __init__(self, backend, release=""):
+        self.backend = backend
+        self.release = release
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, kind, namespace, resource, days, version):
+        return f"{self.release}:{kind}:{namespace}:{resource}:{days[0].isoformat()}:{len(days)}:v{version}"
+
+    def fetch(self, kind, resources, days, render, namespace):
+        """{자원: {"masks": {날짜: 마스크}, "html": 표 HTML}}
+
+        캐시에 없는 자원만 한 번의 쿼리로 계산하고 render(occ, 자원)으로 HTML을 만든다.
+        namespace: 조각 이름 (같은 자원이라도 템플릿이 다르면 다른 키)
+        """
+        resources = [str(r) for r in resources]
+        versions = current_versions(kind, resources)
+        keys = {r: self.key(kind, namespace, r, days, versions[r]) for r in resources}
+
+        entries, missing = {}, []
+        for r in resources:
+            entry = self.backend.get(keys[r])
+            if entry is None:
+                missing.append(r)
+            else:
+                entries[r] = entry
+
+        with self._lock:
+            self.hits += len(entries)
+            self.misses += len(missing)
+
+        if missing:
+            occ = load_occupancy(kind, missing, days)
+            for r in missing:
+                entry = {
+                    "masks": {d.isoformat(): m for d, m in occ.masks(r).items()},
+                    "html": render(occ, r),
+                }
+                self.backend.set(keys[r], entry, ttl=DAY_SECONDS)
+                entries[r] = entry
+
+        return entries
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def template_digest(template_dir):
+    """템플릿 디렉터리 전체 내용 해시 (10자) — 마크업이 바뀐 배포를 구분"""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(template_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, template_dir).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:10]
+
+
+def init_app(app):
+    """환경변수로 백엔드를 골라 app.extensions["grid_cache"]에 등록"""
+    backend = make_backend(
+        os.getenv("GRID_CACHE_BACKEND", "lru"),
+        size=int(os.getenv("GRID_CACHE_SIZE", "512")),
+        url=os.getenv("GRID_CACHE_URL"),
+    )
+    release = os.getenv("GRID_CACHE_RELEASE") or template_digest(os.path.join(app.root_path, app.template_folder))
+    app.extensions["grid_cache"] = GridCache(backend, release)
+    return app.extensions["grid_cache"]
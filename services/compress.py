@@ -0,0 +1,71 @@
+"""✅ 응답 압축 (opt-in: COMPRESS_RESPONSES=1)
+
+- 텍스트 응답(HTML/JSON/CSV 등)이 COMPRESS_MIN_BYTES(기본 1024) 이상이면
+  브라우저가 받는 방식으로 압축: br(brotli 패키지 있을 때) > gzip
+- 스트리밍(SSE)·파일 응답(정적 파일은 services.assets 사전 압축본 사용)은 건너뜀
+- 압축하면 본문이 달라지므로 강한 ETag는 약한 ETag(W/)로 바꿈
+"""
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/plain", "text/css", "text/csv", "text/javascript",
+    "application/json", "application/javascript",
+}
+
+
+class Compressor:
+    def __init__(self, min_bytes=1024, gzip_level=6, brotli_quality=5):
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose(self, accept_encodings):
+        if brotli is not None and accept_encodings["br"]:
+            return "br"
+        if accept_encodings["gzip"]:
+            return "gzip"
+        return None
+
+    def compress(self, data, encoding):
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def __call__(self, response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or "Content-Encoding" in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self.choose(request.accept_encodings)
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_bytes:
+            return response
+
+        response.set_data(self.compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_app(app):
+    if os.getenv("COMPRESS_RESPONSES", "0") != "1":
+        return None
+    compressor = Compressor(min_bytes=int(os.getenv("COMPRESS_MIN_BYTES", "1024")))
+    app.extensions["compressor"] = compressor
+    app.after_request(compressor)
+    return compressor
@@ -0,0 +1,233 @@
+"""✅ 실시간 예약 변경 버스 (읽기 쪽)
+
+워커 프로세스마다 구독 스레드 1개가 slot_events 테이블의 새 행을 읽어
+(종류, 자원)별 구독자 큐로 나눠 준다.
+- Postgres: LISTEN slot_events 로 커밋 즉시 깨어남
+  (LISTEN 연결이 끊기면 backoff 후 다시 연결하고, 그동안은 폴링으로 전달)
+- 그 외(SQLite 등): EVENT_POLL_INTERVAL 초마다 테이블 폴링
+여러 gunicorn 워커가 같은 테이블을 읽으므로 어느 워커에서 커밋해도 모두 받는다.
+
+gthread 워커에서는 열린 스트림/롱폴링 하나가 요청 스레드 하나를 끝날 때까지 잡는다.
+그래서 워커당 동시 스트림을 EVENT_MAX_STREAMS개(기본: GUNICORN_THREADS의 절반)로 제한하고,
+자리가 없으면 503 → 브라우저는 /api/availability ETag 폴링으로 대신 갱신한다 (static/live_grid.js).
+"""
+import json
+import os
+import queue
+import select
+import threading
+import time
+
+from sqlalchemy import text
+
+from db import db
+from db.events import CHANNEL
+from services.logs import get_logger
+
+log = get_logger("events")
+
+MAX_LISTEN_BACKOFF = 60  # LISTEN 재연결 간격 상한 (초)
+
+
+class HeldStream:
+    """스트림 자리를 잡고 있는 응답 본문 — WSGI 서버가 close()를 부르면 (본문을 읽기 전이어도) 자리 반납"""
+
+    def __init__(self, body, release):
+        self._body = body
+        self._release = release
+
+    def __iter__(self):
+        return self._body
+
+    def close(self):
+        self._body.close()
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+
+class EventBus:
+    def __init__(self, app, poll_interval=1.0, max_streams=4):
+        self.app = app
+        self.poll_interval = poll_interval
+        self._streams = threading.BoundedSemaphore(max_streams)
+        self._subscribers = {}  # (kind, resource) → set(Queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._last_id = 0
+
+    # ---------------- 구독 ----------------
+    def subscribe(self, kind, resource, after=None):
+        """구독 큐 반환. after가 있으면 그 뒤 이벤트부터 먼저 채워 둠"""
+        self._ensure_thread()
+        q = queue.Queue()
+        key = (kind, str(resource))
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(q)
+            live_from = self._last_id
+        if after is not None and after < live_from:
+            for event in self._read(after, upto=live_from, key=key):
+                q.put(event)
+        return q
+
+    def unsubscribe(self, kind, resource, q):
+        with self._lock:
+            subs = self._subscribers.get((kind, str(resource)))
+            if subs:
+                subs.discard(q)
+                if not subs:
+                    del self._subscribers[(kind, str(resource))]
+
+    def open_stream(self, kind, resource, after=None, **options):
+        """스트림 자리를 잡고 SSE 응답 본문 반환 (자리가 없으면 None)"""
+        if not self._streams.acquire(blocking=False):
+            return None
+        return HeldStream(self.stream(kind, resource, after, **options), self._streams.release)
+
+    def stream(self, kind, resource, after=None, max_seconds=300, heartbeat=15):
+        """SSE 본문 생성기 — max_seconds 후 종료하면 브라우저가 Last-Event-ID로 재접속"""
+        q = self.subscribe(kind, resource, after)
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                try:
+                    yield format_sse(q.get(timeout=heartbeat))
+                except queue.Empty:
+                    yield ": ping\n\n"
+        finally:
+            self.unsubscribe(kind, resource, q)
+
+    def wait(self, kind, resource, after=None, timeout=25):
+        """롱폴링 — 이벤트가 하나라도 오거나 timeout이 지나면 모아서 반환 (스트림 자리가 없으면 None)"""
+        if not self._streams.acquire(blocking=False):
+            return None
+        q = self.subscribe(kind, resource, after)
+        events = []
+        try:
+            try:
+                events.append(q.get(timeout=timeout))
+                while True:
+                    events.append(q.get_nowait())
+            except queue.Empty:
+                pass
+        finally:
+            self.unsubscribe(kind, resource, q)
+            self._streams.release()
+        return events
+
+    # ---------------- 구독 스레드 ----------------
+    def _ensure_thread(self):
+        # gunicorn fork 이후에는 새 프로세스에서 스레드를 다시 띄움
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            with self.app.app_context():
+                self._last_id = self._max_id()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="slot-event-bus", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        with self.app.app_context():
+            listen = db.engine.dialect.name == "postgresql"
+        listener, retry_at, backoff = None, 0.0, self.poll_interval
+        while True:
+            if listen and listener is None and time.monotonic() >= retry_at:
+                try:
+                    with self.app.app_context():
+                        listener = PgListener(db.engine)
+                except Exception:
+                    # 다시 붙을 때까지는 폴링으로 계속 전달
+                    log.warning("event bus LISTEN failed", exc_info=True, extra={"retry_in_s": backoff})
+                    retry_at = time.monotonic() + backoff
+                    backoff = min(backoff * 2, MAX_LISTEN_BACKOFF)
+            try:
+                if listener is not None:
+                    listener.wait(self.poll_interval * 15)
+                    backoff = self.poll_interval
+                else:
+                    time.sleep(self.poll_interval)
+            except Exception:
+                # 연결이 끊김 (Postgres 재시작, 유휴 연결 정리 등) → 버리고 backoff 후 다시 LISTEN
+                log.warning("event bus LISTEN connection lost", exc_info=True)
+                listener.close()
+                listener, retry_at = None, time.monotonic() + backoff
+            try:
+                self._dispatch()
+            except Exception:
+                log.exception("event bus error")
+                time.sleep(self.poll_interval)
+
+    def _dispatch(self):
+        with self._lock:
+            if not self._subscribers:
+                # 구독자가 없어도 위치는 따라감 (나중 구독자가 옛 이벤트를 받지 않도록)
+                with self.app.app_context():
+                    self._last_id = self._max_id()
+                return
+        for event in self._read(self._last_id):
+            key = (event["kind"], event["resource"])
+            with self._lock:
+                self._last_id = max(self._last_id, event["id"])
+                subs = list(self._subscribers.get(key, ()))
+            for q in subs:
+                q.put(event)
+
+    # ---------------- DB ----------------
+    def _max_id(self):
+        return db.session.execute(text("SELECT COALESCE(MAX(id), 0) FROM slot_events")).scalar()
+
+    def _read(self, after, upto=None, key=None):
+        sql = "SELECT id, payload FROM slot_events WHERE id > :after"
+        params = {"after": after}
+        if upto is not None:
+            sql += " AND id <= :upto"
+            params["upto"] = upto
+        if key is not None:
+            sql += " AND kind = :kind AND resource = :resource"
+            params.update(kind=key[0], resource=key[1])
+        with self.app.app_context():
+            rows = db.session.execute(text(sql + " ORDER BY id"), params).all()
+            db.session.remove()
+        return [dict(json.loads(payload), id=event_id) for event_id, payload in rows]
+
+
+class PgListener:
+    """풀에서 떼어 낸 전용 연결에서 LISTEN — 알림이 오거나 timeout이 지나면 wait()가 반환"""
+
+    def __init__(self, engine):
+        self._raw = engine.raw_connection()
+        self._raw.detach()  # 풀로 돌아가 다른 요청이 쓰지 않도록
+        self._conn = self._raw.driver_connection
+        self._conn.autocommit = True
+        self._conn.cursor().execute(f"LISTEN {CHANNEL}")
+
+    def wait(self, timeout):
+        if select.select([self._conn], [], [], timeout)[0]:
+            self._conn.poll()
+            self._conn.notifies.clear()
+
+    def close(self):
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+
+
+def format_sse(event):
+    return f"id: {event['id']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def init_app(app):
+    threads = int(os.getenv("GUNICORN_THREADS", "8"))
+    bus = EventBus(
+        app,
+        poll_interval=float(os.getenv("EVENT_POLL_INTERVAL", "1.0")),
+        max_streams=int(os.getenv("EVENT_MAX_STREAMS", max(1, threads // 2))),
+    )
+    app.extensions["event_bus"] = bus
+    return bus
@@ -0,0 +1,104 @@
+"""✅ 구조화 로깅 (JSON lines, 백그라운드 쓰기)
+
+요청 처리 스레드는 로그 레코드를 큐에 넣기만 하고, stdout 쓰기는 워커별 백그라운드
+스레드(QueueListener)가 한다. DEBUG 레코드는 LOG_DEBUG_SAMPLE 비율만 남긴다.
+
+    log = get_logger(__name__)
+    log.info("booking created", extra={"kind": "group", "resource": "1"})
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+ROOT = "studyroom"
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """LogRecord → 한 줄 JSON (extra 필드 포함)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """DEBUG 레코드는 rate 비율만 통과 (그 외 레벨은 모두 통과)"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.rate
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """큐에 넣기만 하는 핸들러. 프로세스마다(gunicorn fork 이후 포함) 쓰기 스레드를 띄움"""
+
+    def __init__(self, target):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()  # fork 전 큐/스레드는 버림
+            self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def stop(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid = None
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT}.{name}" if not name.startswith(ROOT) else name)
+
+
+def init_logging(level=None, debug_sample=None):
+    """studyroom.* 로거에 JSON 큐 핸들러 연결 (여러 번 호출해도 한 번만 설정)"""
+    root = logging.getLogger(ROOT)
+    if any(isinstance(h, BackgroundQueueHandler) for h in root.handlers):
+        return root
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JSONFormatter())
+
+    handler = BackgroundQueueHandler(stream)
+    handler.addFilter(DebugSampler(float(debug_sample if debug_sample is not None
+                                         else os.getenv("LOG_DEBUG_SAMPLE", "0.1"))))
+    root.addHandler(handler)
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO").upper())
+    root.propagate = False
+    atexit.register(handler.stop)
+    return root
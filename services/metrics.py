@@ -0,0 +1,190 @@
+"""✅ 요청 단위 계측 — SQL 수/시간, 템플릿 렌더 시간, 전체 지연
+
+- SQL: SQLAlchemy 엔진 이벤트 (before/after_cursor_execute)
+- 템플릿: Flask before_render_template / template_rendered 시그널
+- 응답 크기: 압축 후 본문 바이트 (bytes-on-wire)
+- 결과: 라우트별 누적 → /metrics (Prometheus 텍스트), 응답 헤더 Server-Timing
+- SLOW_REQUEST_MS(기본 500) 이상 걸린 요청은 쿼리 목록과 함께 구조화 로그 (services.logs)
+
+값은 워커 프로세스별로 누적된다 (pid 라벨로 구분).
+"""
+import os
+import threading
+import time
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+
+from db import db
+from services.logs import get_logger
+
+log = get_logger("metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# 원래 오래 붙잡고 있는 엔드포인트 (SSE/롱폴링) → 느린 요청 로그 제외
+SLOW_EXEMPT = {"events", "events_poll"}
+
+
+def format_value(value):
+    return f"{value:.6f}" if isinstance(value, float) else str(value)
+
+
+class RouteStats:
+    __slots__ = ("count", "errors", "buckets", "total", "db_queries", "db_seconds", "template_seconds",
+                 "response_bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.response_bytes = 0
+
+
+class Metrics:
+    def __init__(self, slow_ms=500):
+        self.slow_seconds = slow_ms / 1000
+        self.routes = {}
+        self._lock = threading.Lock()
+
+    # ---------------- 수집 ----------------
+    def _state(self):
+        if not has_request_context():
+            return None
+        state = g.get("_metrics")
+        if state is None:
+            state = g._metrics = {"start": time.perf_counter(), "queries": [], "templates": [], "tpl_stack": []}
+        return state
+
+    def on_before_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    def on_after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        state = self._state()
+        if state is not None:
+            state["queries"].append((statement, time.perf_counter() - context._query_start))
+
+    def on_before_render(self, sender, template, context, **extra):
+        state = self._state()
+        if state is not None:
+            state["tpl_stack"].append(time.perf_counter())
+
+    def on_rendered(self, sender, template, context, **extra):
+        state = self._state()
+        if state is not None and state["tpl_stack"]:
+            state["templates"].append((template.name, time.perf_counter() - state["tpl_stack"].pop()))
+
+    def finish(self, response=None, error=None):
+        """요청 종료 시 라우트별 누적 (+ Server-Timing 헤더, 느린 요청 로그)"""
+        state = g.pop("_metrics", None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state["start"]
+        db_seconds = sum(s for _, s in state["queries"])
+        template_seconds = sum(s for _, s in state["templates"])
+        route = request.endpoint or "unmatched"
+        failed = error is not None or (response is not None and response.status_code >= 500)
+        # 압축 후 실제 전송 크기 (스트리밍 응답은 길이를 알 수 없어 0)
+        sent = (response.content_length or 0) if response is not None and not response.is_streamed else 0
+
+        with self._lock:
+            stats = self.routes.setdefault(route, RouteStats())
+            stats.count += 1
+            stats.errors += 1 if failed else 0
+            stats.total += elapsed
+            stats.db_queries += len(state["queries"])
+            stats.db_seconds += db_seconds
+            stats.template_seconds += template_seconds
+            stats.response_bytes += sent
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    stats.buckets[i] += 1
+
+        if response is not None:
+            response.headers["Server-Timing"] = (
+                f"db;dur={db_seconds * 1000:.1f};desc=\"{len(state['queries'])} queries\", "
+                f"tpl;dur={template_seconds * 1000:.1f}, total;dur={elapsed * 1000:.1f}"
+            )
+
+        if elapsed >= self.slow_seconds and route not in SLOW_EXEMPT:
+            self.log_slow(route, elapsed, db_seconds, template_seconds, state["queries"])
+        return response
+
+    def log_slow(self, route, elapsed, db_seconds, template_seconds, queries):
+        log.warning("slow request", extra={
+            "route": route,
+            "ms": round(elapsed * 1000, 1),
+            "db_ms": round(db_seconds * 1000, 1),
+            "tpl_ms": round(template_seconds * 1000, 1),
+            "queries": [
+                {"ms": round(seconds * 1000, 1), "sql": " ".join(statement.split())[:300]}
+                for statement, seconds in queries
+            ],
+        })
+
+    # ---------------- 출력 ----------------
+    def render_prometheus(self, extra=None):
+        pid = os.getpid()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+        with self._lock:
+            routes = sorted(self.routes.items())
+            hist = []
+            for route, s in routes:
+                labels = f'route="{route}",pid="{pid}"'
+                for bound, count in zip(LATENCY_BUCKETS, s.buckets):
+                    hist.append(f'studyroom_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                hist.append(f'studyroom_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+                hist.append(f"studyroom_request_duration_seconds_sum{{{labels}}} {s.total:.6f}")
+                hist.append(f"studyroom_request_duration_seconds_count{{{labels}}} {s.count}")
+            metric("studyroom_request_duration_seconds", "histogram", "요청 처리 시간", hist)
+
+            for name, attr, help_text in (
+                ("studyroom_request_errors_total", "errors", "5xx/예외 요청 수"),
+                ("studyroom_db_queries_total", "db_queries", "SQL 실행 수"),
+                ("studyroom_db_seconds_total", "db_seconds", "SQL 실행 시간 합"),
+                ("studyroom_template_seconds_total", "template_seconds", "템플릿 렌더 시간 합"),
+                ("studyroom_response_bytes_total", "response_bytes", "응답 본문 전송 바이트 (압축 후)"),
+            ):
+                metric(name, "counter", help_text, [
+                    f'{name}{{route="{route}",pid="{pid}"}} {format_value(getattr(s, attr))}'
+                    for route, s in routes
+                ])
+
+        for name, (help_text, value) in (extra or {}).items():
+            metric(name, "counter", help_text, [f'{name}{{pid="{pid}"}} {value}'])
+        return "\n".join(lines) + "\n"
+
+
+def init_app(app):
+    metrics = Metrics(slow_ms=float(os.getenv("SLOW_REQUEST_MS", "500")))
+    app.extensions["metrics"] = metrics
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", metrics.on_before_cursor)
+        event.listen(db.engine, "after_cursor_execute", metrics.on_after_cursor)
+    before_render_template.connect(metrics.on_before_render, app)
+    template_rendered.connect(metrics.on_rendered, app)
+
+    @app.before_request
+    def _start_metrics():
+        metrics._state()
+
+    @app.after_request
+    def _finish_metrics(response):
+        return metrics.finish(response)
+
+    @app.teardown_request
+    def _finish_failed(error):
+        if error is not None:
+            metrics.finish(error=error)
+
+    return metrics
@@ -0,0 +1,33 @@
+"""✅ Jinja 환경 — 바이트코드 캐시 + 미리 컴파일
+
+- JINJA_CACHE_DIR (기본: 임시 디렉터리/studyroom-jinja)에 컴파일된 바이트코드 저장
+  → 워커가 새로 떠도 템플릿 소스를 다시 파싱/컴파일하지 않음
+- precompile(): 모든 템플릿을 한 번 로드 (flask --app app compile-templates,
+  gunicorn preload 시 마스터에서 실행 → fork된 워커는 컴파일된 템플릿을 그대로 물려받음)
+"""
+import os
+import tempfile
+
+from jinja2 import FileSystemBytecodeCache
+
+
+def init_app(app):
+    """app.jinja_env 가 만들어지기 전에 호출해야 함"""
+    cache_dir = os.getenv("JINJA_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "studyroom-jinja")
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        "bytecode_cache": FileSystemBytecodeCache(cache_dir),
+        # ✅ 블록 태그 주변 공백/줄바꿈 제거 → 예약표 HTML 크기 감소
+        "trim_blocks": True,
+        "lstrip_blocks": True,
+    }
+
+
+def precompile(app):
+    """모든 템플릿 로드 (바이트코드 캐시 + 메모리 캐시 채움) → 템플릿 수"""
+    env = app.jinja_env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,146 @@
+// ✅ 예약표 실시간 갱신 — /events (SSE), 지원하지 않으면 /events/poll (롱폴링)
+// 서버의 스트림 자리가 다 차서 503이면 /api/availability 를 짧게 폴링하다가 1분 뒤 스트림 재시도
+// 사용: liveGrid({ kind, resource, after, reserveHref: (resource, date, hour) => url, onEvent })
+const FALLBACK_POLL_MS = 10000;
+const STREAM_RETRY_MS = 60000;
+
+function liveGrid(options) {
+  const kind = options.kind;
+  let resource = String(options.resource);
+  let lastId = options.after || 0;
+  let source = null;
+  let generation = 0;
+
+  function cell(date, hour) {
+    return document.querySelector(`td[data-date="${date}"][data-hour="${hour}"]`);
+  }
+
+  function apply(event) {
+    if (event.id) lastId = Math.max(lastId, event.id);
+    if (event.kind !== kind || event.resource !== resource) return;
+
+    for (const [date, hours] of event.slots) {
+      for (const hour of hours) {
+        const td = cell(date, hour);
+        if (!td) continue;
+        td.replaceChildren();
+        if (event.op === "booked") {
+          td.className = "reserved";
+          td.textContent = event.label || "예약됨";
+        } else {
+          td.className = "free";
+          const a = document.createElement("a");
+          a.className = "btn";
+          a.href = options.reserveHref(resource, date, hour);
+          a.textContent = "예약 가능";
+          td.appendChild(a);
+        }
+      }
+    }
+    if (options.onEvent) options.onEvent(event);
+  }
+
+  // 표에 보이는 날짜들 (오름차순)
+  function visibleDates() {
+    const dates = new Set();
+    document.querySelectorAll("td[data-date]").forEach(td => dates.add(td.dataset.date));
+    return [...dates].sort();
+  }
+
+  // 점유 마스크와 표가 다른 칸만 예약/해제 이벤트로 만들어 반영 (예약자 이름은 알 수 없음)
+  function applyMasks(days, masks) {
+    const changed = { booked: [], released: [] };
+    days.forEach((date, i) => {
+      const hours = { booked: [], released: [] };
+      for (let hour = 0; hour < 24; hour++) {
+        const td = cell(date, hour);
+        if (!td) continue;
+        const booked = (masks[i] >> hour) & 1;
+        if (booked && td.className !== "reserved") hours.booked.push(hour);
+        if (!booked && td.className === "reserved") hours.released.push(hour);
+      }
+      for (const op in hours) if (hours[op].length) changed[op].push([date, hours[op]]);
+    });
+    for (const op in changed) {
+      if (changed[op].length) apply({ kind, resource, op, slots: changed[op], label: null });
+    }
+  }
+
+  // 브라우저 캐시가 ETag로 재검증 → 바뀌지 않았으면 서버는 예약표를 읽지 않고 304 (버전 조회 몇 번만)
+  async function pollAvailability(gen) {
+    const retryAt = Date.now() + STREAM_RETRY_MS;
+    while (gen === generation) {
+      await new Promise(resolve => setTimeout(resolve, FALLBACK_POLL_MS));
+      if (gen !== generation) return;
+      if (Date.now() >= retryAt) {
+        open();
+        return;
+      }
+      const dates = visibleDates();
+      if (!dates.length) continue;
+      try {
+        const resp = await fetch(`/api/availability?kind=${kind}&resource=${encodeURIComponent(resource)}` +
+                                 `&start=${dates[0]}&days=${dates.length}`);
+        if (!resp.ok || gen !== generation) continue;
+        const body = await resp.json();
+        applyMasks(body.days, (body.masks[kind] || {})[resource] || []);
+      } catch (err) {
+        // 다음 주기에 다시 시도
+      }
+    }
+  }
+
+  function query() {
+    return `kind=${kind}&resource=${encodeURIComponent(resource)}&after=${lastId}`;
+  }
+
+  async function poll(gen) {
+    while (gen === generation) {
+      try {
+        const resp = await fetch(`/events/poll?${query()}`);
+        if (resp.status === 503) {
+          pollAvailability(gen);
+          return;
+        }
+        const body = await resp.json();
+        if (gen !== generation) return;
+        body.events.forEach(apply);
+      } catch (err) {
+        await new Promise(resolve => setTimeout(resolve, 5000));
+      }
+    }
+  }
+
+  function open() {
+    const gen = ++generation;
+    if (!window.EventSource) {
+      poll(gen);
+      return;
+    }
+    source = new EventSource(`/events?${query()}`);
+    source.onmessage = e => apply(JSON.parse(e.data));
+    source.onerror = () => {
+      // 200이 아닌 응답(503)이면 EventSource는 재접속하지 않고 닫힘 → 폴링으로 전환
+      if (gen !== generation || source.readyState !== EventSource.CLOSED) return;
+      source = null;
+      pollAvailability(gen);
+    };
+  }
+
+  function close() {
+    generation++;
+    if (source) source.close();
+    source = null;
+  }
+
+  open();
+  return {
+    switchTo(newResource, after) {
+      close();
+      resource = String(newResource);
+      if (after !== undefined) lastId = after;
+      open();
+    },
+    close,
+  };
+}
@@ -0,0 +1,22 @@
+"""✅ 테스트 공통 — 임시 SQLite DB로 앱을 띄우고 테스트마다 스키마를 새로 만든다"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+@pytest.fixture
+def app_ctx():
+    import app as app_module
+    from db import db
+    from db.schema import init_schema
+    with app_module.app.app_context():
+        db.drop_all()
+        init_schema()
+        yield app_module.app
+        db.session.remove()
@@ -0,0 +1,40 @@
+"""✅ 보관 후에도 id가 뒤로 가지 않는지 — 보관 → 예약 → 보관"""
+from datetime import date, datetime, timedelta
+
+from db.archive import archive_before
+from db.booking import book
+
+PAST = date(2020, 3, 2)
+FUTURE = date(2040, 3, 2)
+CUTOFF = datetime(2030, 1, 1)
+
+
+def book_group(day, hour, leader_id):
+    return book("group", members=[(f"M{leader_id}", "팀원")], room="1", date=day, hour=hour, duration=1,
+                leader_id=leader_id, leader_name="n", leader_phone="0", total_people=2)
+
+
+def test_ids_are_not_reused_after_archiving(app_ctx):
+    from db.models import ReservationMember
+    from db.schema import repair_sequences
+
+    future_id = book_group(FUTURE, 10, "A1").id   # 낮은 id, 먼 미래 (반복 예약처럼)
+    past_id = book_group(PAST, 10, "A2").id       # 최대 id → 보관됨
+    assert archive_before(CUTOFF) == {"group": 1, "personal": 0, "members": 1}
+
+    repair_sequences()  # 부팅 시 init-db 와 같은 보정
+    again = book_group(PAST, 11, "A3")
+    assert again.id > past_id > future_id
+    assert ReservationMember.query.filter_by(reservation_id=again.id).one().id > 2
+
+    assert archive_before(CUTOFF) == {"group": 1, "personal": 0, "members": 1}
+
+
+def test_repair_sequences_counts_archived_ids(app_ctx):
+    from db import db
+    from db.schema import max_id_sql
+
+    book_group(PAST, 10, "A1")
+    book_group(PAST + timedelta(days=1), 10, "A2")
+    archive_before(CUTOFF)
+    assert db.session.execute(db.text(max_id_sql("reservations"))).scalar() == 2
@@ -0,0 +1,107 @@
+"""✅ db.conflicts 구간 비교가 시간 칸(slot) 모델과 같은 결과를 내는지 — 고정 시드 무작위 검사
+
+시간 칸 모델: 예약 = date의 hour시부터 duration개의 1시간 칸 (자정을 넘기면 다음날 칸),
+같은 방/좌석 칸이 겹치면 "resource", 같은 학번의 다른 종류 예약 칸이 겹치면 "student".
+"""
+import random
+from datetime import date, datetime, timedelta
+
+from db.conflicts import IntervalIndex, booking_conflict, extension_conflict, overlaps
+
+BASE = datetime(2030, 1, 1)
+OTHER = {"group": "personal", "personal": "group"}
+
+
+def hour_slots(day, hour, duration):
+    start = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+    return {start + timedelta(hours=i) for i in range(duration)}
+
+
+def test_overlaps_half_open():
+    a, b, c = BASE, BASE + timedelta(hours=1), BASE + timedelta(hours=2)
+    assert overlaps(a, c, b, c)
+    assert not overlaps(a, b, b, c)  # 끝과 시작이 맞닿으면 겹치지 않음
+
+
+def test_interval_index_matches_brute_force():
+    rng = random.Random(20)
+    for _ in range(3000):
+        intervals = []
+        for value in range(rng.randint(0, 12)):
+            start = BASE + timedelta(hours=rng.randint(0, 60))
+            intervals.append((start, start + timedelta(hours=rng.randint(1, 6)), value))
+        start = BASE + timedelta(hours=rng.randint(0, 60))
+        end = start + timedelta(hours=rng.randint(1, 6))
+
+        expected = [v for s, e, v in sorted(intervals, key=lambda iv: iv[0]) if overlaps(s, e, start, end)]
+        assert IntervalIndex(intervals).overlapping(start, end) == expected  # 시작 시각 순
+
+
+def test_midnight_spill(app_ctx):
+    from db.booking import book
+    day = date(2030, 1, 1)
+    fields = dict(leader_name="김", leader_phone="0", total_people=1)
+    book("group", room="1", date=day, hour=23, duration=2, leader_id="A1", **fields)
+
+    next_day = day + timedelta(days=1)
+    assert booking_conflict("group", "1", "B1", next_day, 0, 1)[0] == "resource"
+    assert booking_conflict("group", "1", "B1", next_day, 1, 1) is None
+    assert booking_conflict("personal", "3", "A1", next_day, 0, 1)[0] == "student"
+    assert booking_conflict("personal", "3", "A1", day, 22, 1) is None
+
+
+def test_conflicts_match_hour_slot_model(app_ctx):
+    from db import db
+    from db.booking import MODELS, book, extend
+
+    rng = random.Random(7)
+    taken = set()          # (종류, 자원, 칸)
+    by_student = {}        # (학번, 종류) → 칸 집합
+    booked = []            # (종류, id, 자원, 학번)
+    seen = {None: 0, "resource": 0, "student": 0}
+
+    def expected(kind, resource, student_id, slots):
+        if slots & by_student.get((student_id, OTHER[kind]), set()):
+            return "student"
+        if any((kind, resource, s) in taken for s in slots):
+            return "resource"
+        return None
+
+    def claim(kind, resource, student_id, slots):
+        taken.update((kind, resource, s) for s in slots)
+        by_student.setdefault((student_id, kind), set()).update(slots)
+
+    for _ in range(800):
+        kind = rng.choice(["group", "personal"])
+        resource = str(rng.randint(1, 2 if kind == "group" else 3))
+        day = (BASE + timedelta(days=rng.randint(0, 3))).date()
+        hour = rng.choice([21, 22, 23, rng.randint(0, 23)])  # 자정 넘김을 자주 섞음
+        duration = rng.randint(1, 3)
+        student_id = f"S{rng.randint(1, 6)}"
+        slots = hour_slots(day, hour, duration)
+
+        want = expected(kind, resource, student_id, slots)
+        found = booking_conflict(kind, resource, student_id, day, hour, duration)
+        assert (found[0] if found else None) == want
+        seen[want] += 1
+        if want is None:
+            fields = {"room" if kind == "group" else "seat": resource}
+            r = book(kind, date=day, hour=hour, duration=duration, leader_id=student_id,
+                     leader_name="n", leader_phone="0", total_people=1, **fields)
+            claim(kind, resource, student_id, slots)
+            booked.append((kind, r.id, resource, student_id))
+
+        if booked and rng.random() < 0.3:
+            kind, reservation_id, resource, student_id = rng.choice(booked)
+            r = db.session.get(MODELS[kind], reservation_id)
+            extra = rng.randint(1, 2)
+            new_slots = {r.end_at + timedelta(hours=i) for i in range(extra)}
+
+            want = expected(kind, resource, student_id, new_slots)
+            found = extension_conflict(kind, r, extra)
+            assert (found[0] if found else None) == want
+            if want is None:
+                extend(kind, r, extra)
+                claim(kind, resource, student_id, new_slots)
+
+    assert all(seen.values())  # 세 경우 모두 실제로 검사됨